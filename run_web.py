@@ -13,12 +13,9 @@ if SRC_PATH not in sys.path:
 
 # Correct imports
 from web.app import web_app
-from models.llm_config import LLMConfig
 
 if __name__ == "__main__":
-    # Initialize LLM
-    LLMConfig.get_llm()
-    
+    # The LLM is warmed up in the background by the app's startup hook
     print("="*60)
     print("Starting JIRA Agent Chatbot Web Interface")
     print("="*60)
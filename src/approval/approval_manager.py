@@ -2,23 +2,45 @@
 Approval manager for human-in-the-loop operations.
 All write operations require human approval before execution.
 """
+import functools
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
-from datetime import datetime
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Union, ValuesView
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from enum import Enum
-from tools.jira_tool import get_jira_client as JiraTool
-from tools.jira_operations import (
-    create_ticket,
-    update_ticket,
-    transition_ticket,
-    assign_ticket,
-    add_comment
-)
-jira_tool = JiraTool()
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+_now = datetime.now
+
+
+def _trace(fn):
+    """Log entry/exit of ``fn`` at DEBUG level."""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return fn(*args, **kwargs)
+        logger.debug("%s called", name)
+        result = fn(*args, **kwargs)
+        logger.debug("%s completed", name)
+        return result
+
+    return wrapper
+
+
+_SEPARATOR = "=" * 60
+_FOOTER = (
+    f"\n{_SEPARATOR}\n"
+    "Type 'approve {request_id}' to proceed or 'reject {request_id}' to cancel\n"
+    f"{_SEPARATOR}\n"
+)
+
 
 class ApprovalStatus(Enum):
     """Status of an approval request."""
@@ -28,7 +50,7 @@ class ApprovalStatus(Enum):
     EXPIRED = "expired"
 
 
-@dataclass
+@dataclass(slots=True)
 class ApprovalRequest:
     """Represents a pending approval request."""
     request_id: str
@@ -43,20 +65,68 @@ class ApprovalRequest:
     
     def __post_init__(self):
         if self.created_at is None:
-            self.created_at = datetime.now()
+            self.created_at = _now()
         if self.preview is None:
             self.preview = {}
 
 
+def _format_approval_message(
+    request_id: str,
+    operation_type: str,
+    ticket_key: Optional[str],
+    description: str,
+    preview_items: Tuple[Tuple[str, str], ...],
+) -> str:
+    """Build the approval message shown for a request."""
+    lines = [
+        "",
+        _SEPARATOR,
+        f"⚠️  APPROVAL REQUIRED - {operation_type.upper()}",
+        _SEPARATOR,
+        f"Request ID: {request_id}",
+    ]
+    
+    if ticket_key:
+        lines.append(f"Ticket: {ticket_key}")
+    
+    if description:
+        lines.append(f"\nDescription: {description}")
+    
+    lines.append("\n📋 PREVIEW OF CHANGES:")
+    for key, value in preview_items:
+        lines.append(f"  • {key}: {value}")
+    
+    lines.append(_FOOTER)
+    
+    return "\n".join(lines)
+
+
+# Result message per approved operation_type; formatted with the request's
+# preview plus ticket_key and the executor's return value as result
+_APPROVED_ACTION_MESSAGES = {
+    "add_comment": "Comment added to {ticket_key}",
+    "transition_ticket": "Ticket {ticket_key} transitioned to {target_status}",
+    "assign_ticket": "Ticket {ticket_key} assigned to {new_assignee}",
+    "update_ticket": "Ticket {ticket_key} updated",
+    "create_ticket": "Ticket created: {result}",
+}
+
+
 class ApprovalManager:
     """Manages approval requests and human-in-the-loop operations."""
     
     def __init__(self):
-        logger.info("ApprovalManager.__init__ called")
-        self.pending_approvals: Dict[str, ApprovalRequest] = {}
+        # Insertion-ordered, so the oldest pending request is always first
+        self.pending_approvals: OrderedDict[str, ApprovalRequest] = OrderedDict()
         self.approval_history: List[ApprovalRequest] = []
-        logger.info("ApprovalManager.__init__ completed")
+        self.history_index: Dict[str, ApprovalRequest] = {}
+        # Bumped on every mutation so callers can cache derived views
+        self.version: int = 0
+        # One short critical section per mutation; reentrant because
+        # create_approval_request sweeps before inserting
+        self._lock = threading.RLock()
     
+    @_trace
     def create_approval_request(
         self,
         operation_type: str,
@@ -64,7 +134,6 @@ class ApprovalManager:
         description: str = "",
         ticket_key: Optional[str] = None
     ) -> ApprovalRequest:
-        logger.info("ApprovalManager.create_approval_request called with operation_type=%s, ticket_key=%s", operation_type, ticket_key)
         """
         Create a new approval request.
         
@@ -77,8 +146,7 @@ class ApprovalManager:
         Returns:
             ApprovalRequest object
         """
-        import uuid
-        request_id = str(uuid.uuid4())
+        request_id = uuid.uuid4().hex
         
         approval = ApprovalRequest(
             request_id=request_id,
@@ -89,47 +157,33 @@ class ApprovalManager:
             status=ApprovalStatus.PENDING
         )
         
-        self.pending_approvals[request_id] = approval
+        with self._lock:
+            self.sweep_expired()
+            self.pending_approvals[request_id] = approval
+            self.version += 1
         logger.info("Created approval request %s for operation: %s", request_id, operation_type)
-        logger.info("ApprovalManager.create_approval_request completed for request_id=%s", request_id)
         return approval
     
     def format_approval_message(self, approval: ApprovalRequest) -> str:
-        logger.info("ApprovalManager.format_approval_message called for request_id=%s", approval.request_id)
         """
         Format an approval request as a human-readable message.
         
         Returns:
             Formatted message string
         """
-        lines = [
-            f"\n{'='*60}",
-            f"⚠️  APPROVAL REQUIRED - {approval.operation_type.upper()}",
-            f"{'='*60}",
-            f"Request ID: {approval.request_id}",
-        ]
-        
-        if approval.ticket_key:
-            lines.append(f"Ticket: {approval.ticket_key}")
-        
-        if approval.description:
-            lines.append(f"\nDescription: {approval.description}")
-        
-        lines.append("\n📋 PREVIEW OF CHANGES:")
-        for key, value in approval.preview.items():
-            if value is not None:
-                lines.append(f"  • {key}: {value}")
-        
-        lines.append(f"\n{'='*60}")
-        lines.append("Type 'approve {request_id}' to proceed or 'reject {request_id}' to cancel")
-        lines.append(f"{'='*60}\n")
-        
-        result = "\n".join(lines)
-        logger.info("ApprovalManager.format_approval_message completed for request_id=%s", approval.request_id)
-        return result
+        preview_items = tuple(
+            (key, str(value)) for key, value in approval.preview.items() if value is not None
+        )
+        return _format_approval_message(
+            approval.request_id,
+            approval.operation_type,
+            approval.ticket_key,
+            approval.description,
+            preview_items,
+        )
     
-    def approve(self, request_id: str, approved_by: str = "user") -> bool:
-        logger.info("ApprovalManager.approve called for request_id=%s by %s", request_id, approved_by)
+    @_trace
+    def approve(self, request_id: str, approved_by: str = "user") -> Optional[ApprovalRequest]:
         """
         Approve a pending request.
         
@@ -138,24 +192,24 @@ class ApprovalManager:
             approved_by: Who approved it
             
         Returns:
-            True if approved, False if not found
+            The approved request, or None if not found
         """
-        if request_id not in self.pending_approvals:
-            logger.warning("Approval request %s not found", request_id)
-            logger.info("ApprovalManager.approve completed (not found) for request_id=%s", request_id)
-            return False
-        approval = self.pending_approvals[request_id]
-        approval.status = ApprovalStatus.APPROVED
-        approval.approved_by = approved_by
-        # Move to history
-        self.approval_history.append(approval)
-        del self.pending_approvals[request_id]
+        with self._lock:
+            approval = self.pending_approvals.pop(request_id, None)
+            if approval is None:
+                logger.warning("Approval request %s not found", request_id)
+                return None
+            approval.status = ApprovalStatus.APPROVED
+            approval.approved_by = approved_by
+            # Move to history
+            self.approval_history.append(approval)
+            self.history_index[request_id] = approval
+            self.version += 1
         logger.info("Approval request %s approved by %s", request_id, approved_by)
-        logger.info("ApprovalManager.approve completed for request_id=%s", request_id)
-        return True
+        return approval
     
+    @_trace
     def reject(self, request_id: str, reason: str = "", rejected_by: str = "user") -> bool:
-        logger.info("ApprovalManager.reject called for request_id=%s by %s", request_id, rejected_by)
         """
         Reject a pending request.
         
@@ -167,129 +221,125 @@ class ApprovalManager:
         Returns:
             True if rejected, False if not found
         """
-        if request_id not in self.pending_approvals:
-            logger.warning("Approval request %s not found", request_id)
-            logger.info("ApprovalManager.reject completed (not found) for request_id=%s", request_id)
-            return False
-        approval = self.pending_approvals[request_id]
-        approval.status = ApprovalStatus.REJECTED
-        approval.rejection_reason = reason
-        approval.approved_by = rejected_by
-        # Move to history
-        self.approval_history.append(approval)
-        del self.pending_approvals[request_id]
+        with self._lock:
+            approval = self.pending_approvals.pop(request_id, None)
+            if approval is None:
+                logger.warning("Approval request %s not found", request_id)
+                return False
+            approval.status = ApprovalStatus.REJECTED
+            approval.rejection_reason = reason
+            approval.approved_by = rejected_by
+            # Move to history
+            self.approval_history.append(approval)
+            self.history_index[request_id] = approval
+            self.version += 1
         logger.info("Approval request %s rejected by %s: %s", request_id, rejected_by, reason)
-        logger.info("ApprovalManager.reject completed for request_id=%s", request_id)
         return True
     
     def get_approval(self, request_id: str) -> Optional[ApprovalRequest]:
-        logger.info("ApprovalManager.get_approval called for request_id=%s", request_id)
-        result = self.pending_approvals.get(request_id)
-        logger.info("ApprovalManager.get_approval completed for request_id=%s", request_id)
-        return result
+        return self.pending_approvals.get(request_id)
+    
+    def find(self, request_id: str) -> Optional[ApprovalRequest]:
+        """Look up a request by ID, whether still pending or already decided."""
+        return self.pending_approvals.get(request_id) or self.history_index.get(request_id)
     
     def is_approved(self, request_id: str) -> bool:
-        logger.info("ApprovalManager.is_approved called for request_id=%s", request_id)
-        approval = self.get_approval(request_id)
-        if not approval:
-            # Check history
-            for hist_approval in self.approval_history:
-                if hist_approval.request_id == request_id:
-                    result = hist_approval.status == ApprovalStatus.APPROVED
-                    logger.info("ApprovalManager.is_approved completed for request_id=%s (from history)", request_id)
-                    return result
-            logger.info("ApprovalManager.is_approved completed for request_id=%s (not found)", request_id)
-            return False
-        result = approval.status == ApprovalStatus.APPROVED
-        logger.info("ApprovalManager.is_approved completed for request_id=%s", request_id)
-        return result
+        approval = self.find(request_id)
+        return approval is not None and approval.status == ApprovalStatus.APPROVED
     
-    def get_pending_approvals(self) -> List[ApprovalRequest]:
-        logger.info("ApprovalManager.get_pending_approvals called")
-        result = list(self.pending_approvals.values())
-        logger.info("ApprovalManager.get_pending_approvals completed")
-        return result
+    def get_pending_approvals(
+        self, as_list: bool = False
+    ) -> Union[ValuesView[ApprovalRequest], List[ApprovalRequest]]:
+        """
+        Return pending approval requests, oldest first.
+
+        Args:
+            as_list: Return a snapshot list instead of a live view. Use it when
+                indexing, or when iterating while other threads may mutate.
+
+        Returns:
+            A live view of pending requests, or a list if as_list is set
+        """
+        with self._lock:
+            self.sweep_expired()
+            if as_list:
+                return list(self.pending_approvals.values())
+            return self.pending_approvals.values()
+
+    def pending_snapshot(self) -> Tuple[int, List[ApprovalRequest]]:
+        """
+        Expire stale requests, then return the version and the pending
+        requests it describes, read in one critical section.
 
+        Returns:
+            (version, pending requests oldest first)
+        """
+        with self._lock:
+            self.sweep_expired()
+            return self.version, list(self.pending_approvals.values())
+
+    def sweep_expired(self, ttl_seconds: Optional[int] = None) -> int:
+        """
+        Expire pending requests older than the TTL.
+
+        Pending requests are kept in creation order, so the sweep pops from the
+        front and stops at the first request that is still fresh.
+
+        Returns:
+            Number of requests expired
+        """
+        if ttl_seconds is None:
+            ttl_seconds = settings.APPROVAL_TTL_SECONDS
+        cutoff = _now() - timedelta(seconds=ttl_seconds)
+        expired = 0
+        with self._lock:
+            while self.pending_approvals:
+                request_id, approval = next(iter(self.pending_approvals.items()))
+                if approval.created_at >= cutoff:
+                    break
+                self.pending_approvals.popitem(last=False)
+                approval.status = ApprovalStatus.EXPIRED
+                self.approval_history.append(approval)
+                self.history_index[request_id] = approval
+                expired += 1
+            if expired:
+                self.version += 1
+        if expired:
+            logger.info("Expired %d pending approval request(s)", expired)
+        return expired
+
+    @_trace
     def execute_approved_action(self, request_id: str):
         """
         Execute the stored Jira action after approval.
         """
-        approval: ApprovalRequest = None
-
         # Approval is already moved to history once approved
-        for item in self.approval_history:
-            if item.request_id == request_id:
-                approval = item
-                break
+        approval = self.history_index.get(request_id)
 
-        if not approval:
-            logger.warning(f"No approved request found for execution: {request_id}")
+        if not approval or approval.status != ApprovalStatus.APPROVED:
+            logger.warning("No approved request found for execution: %s", request_id)
             return "Error: No such approved request."
 
         op = approval.operation_type
         ticket_key = approval.ticket_key
         preview = approval.preview  # contains the inputs (comment, assignee, etc.)
 
-        logger.info(f"Executing approved operation={op} for ticket={ticket_key} preview={preview}")
+        logger.info("Executing approved operation=%s for ticket=%s", op, ticket_key)
+        logger.debug("Approved operation preview: %s", preview)
 
-        try:
-            # ============================
-            # 1. ADD COMMENT
-            # ============================
-            if op == "add_comment":
-                result = add_comment(
-                    ticket_key,
-                    preview.get("comment")
-                )
-                return f"Comment added to {ticket_key}"
-
-            # ============================
-            # 2. TRANSITION STATUS
-            # ============================
-            elif op == "transition_ticket":
-                result = transition_ticket(
-                    ticket_key,
-                    preview.get("target_status")
-                )
-                return f"Ticket {ticket_key} transitioned to {preview.get('target_status')}"
-
-            # ============================
-            # 3. ASSIGN TICKET
-            # ============================
-            elif op == "assign_ticket":
-                result = assign_ticket(
-                    ticket_key,
-                    preview.get("assignee")
-                )
-                return f"Ticket {ticket_key} assigned to {preview.get('assignee')}"
-
-            # ============================
-            # 4. UPDATE SUMMARY
-            # ============================
-            elif op == "update_summary":
-                result = update_ticket(
-                    ticket_key,
-                    summary=preview.get("summary")
-                )
-                return f"Summary updated for {ticket_key}"
-
-            # ============================
-            # 5. CREATE TICKET
-            # ============================
-            elif op == "create_ticket":
-                result = create_ticket(
-                    project_key=preview.get("project_key"),
-                    summary=preview.get("summary"),
-                    description=preview.get("description")
-                )
-                return f"Ticket created: {result}"
-
-            else:
-                return f"Unknown operation type: {op}"
+        # Imported here: jira_operations_approved imports this module
+        from tools.jira_operations_approved import EXECUTORS
+
+        executor = EXECUTORS.get(op)
+        if executor is None:
+            return f"Unknown operation type: {op}"
 
+        try:
+            result = executor(request_id)
         except Exception as e:
-            logger.error(f"Error executing approved action: {e}")
+            logger.error("Error executing approved action: %s", e)
             return f"Error executing action: {str(e)}"
+        return _APPROVED_ACTION_MESSAGES[op].format_map({**preview, "ticket_key": ticket_key, "result": result})
 
 
 # Global approval manager instance
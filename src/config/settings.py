@@ -15,4 +15,13 @@ class Settings:
     JIRA_USERNAME = os.getenv("JIRA_USERNAME")
     JIRA_PAT = os.getenv("JIRA_PAT")  # or password if using basic auth
 
+    # Pending approval requests older than this are expired
+    APPROVAL_TTL_SECONDS = int(os.getenv("APPROVAL_TTL_SECONDS", "3600"))
+
+    # Max concurrent Jira fetches when summarizing several tickets
+    JIRA_FETCH_CONCURRENCY = int(os.getenv("JIRA_FETCH_CONCURRENCY", "8"))
+
+    # SQLite file that keeps ticket summaries across restarts; unset disables it
+    SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH")
+
 settings = Settings()
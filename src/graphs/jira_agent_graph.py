@@ -1,29 +1,31 @@
+import asyncio
 import logging
-import operator
 import re
 from typing import TypedDict, Annotated
 
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, message_chunk_to_message
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, StateGraph
+from langgraph.graph.message import add_messages
 
+from config.settings import settings
 from models.llm_config import LLMConfig
 from tools.jira_tool import fetch_and_summarize_ticket, fetch_tickets_by_status
+from tools.jira_operations import TICKET_KEY_PATTERN
 from tools.jira_operations_approved import (
     create_ticket_with_approval,
     update_ticket_with_approval,
     transition_ticket_with_approval,
     assign_ticket_with_approval,
     add_comment_with_approval,
-    execute_create_ticket,
-    execute_update_ticket,
-    execute_transition_ticket,
-    execute_assign_ticket,
-    execute_add_comment,
+    execute_create_tickets,
+    EXECUTORS,
 )
 from approval.approval_manager import approval_manager
 
 # ---------------------------------------------------------
-# Logging / LLM
+# Logging
 # ---------------------------------------------------------
 logging.basicConfig(
     level=logging.INFO,
@@ -32,8 +34,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-llm = LLMConfig.get_llm()
-logger.info("Initialized LLM for Jira agent with approval workflow")
+# The LLM is created on first use via LLMConfig.get_llm() rather than at
+# import, so importing the graph stays cheap for callers that never reach it.
 
 # ---------------------------------------------------------
 # Canonical command patterns
@@ -41,11 +43,23 @@ logger.info("Initialized LLM for Jira agent with approval workflow")
 # These are the ONLY patterns we use for routing.
 # All are case-insensitive and must match the whole message.
 
+# A Jira issue key such as ESD-123
+_TICKET_KEY = TICKET_KEY_PATTERN
+_TICKET_KEY_RE = re.compile(_TICKET_KEY, re.IGNORECASE)
+# Approval request IDs are uuid4().hex
+_APPROVAL_ID_RE = re.compile(r'[0-9a-f]{32}')
+# Separator between IDs in "approve <id> <id> ..."
+_ID_SEPARATOR_RE = re.compile(r'[\s,]+')
+
 PATTERNS = {
     # READ
     "show_my_tickets": re.compile(r'^show my tickets$', re.IGNORECASE),
     "show_tickets_status": re.compile(r'^show tickets with status (.+)$', re.IGNORECASE),
-    "summarize_ticket": re.compile(r'^summarize ticket ([A-Z][A-Z0-9]+-\d+)$', re.IGNORECASE),
+    # summarize ticket ESD-1 / summarize tickets ESD-1, ESD-2 ESD-3
+    "summarize_ticket": re.compile(
+        rf'^summarize tickets? ({_TICKET_KEY}(?:[\s,]+{_TICKET_KEY})*)$',
+        re.IGNORECASE,
+    ),
 
     # WRITE (approval required)
     # create ticket in ESD summary "Title" description "Body"
@@ -55,27 +69,28 @@ PATTERNS = {
     ),
     # update ticket ESD-1 set summary "New summary"
     "update_ticket": re.compile(
-        r'^update ticket ([A-Z][A-Z0-9]+-\d+) set (\w+) "(.+?)"$',
+        rf'^update ticket ({_TICKET_KEY}) set (\w+) "(.+?)"$',
         re.IGNORECASE,
     ),
     # transition ticket ESD-1 to "In Progress"
     "transition_ticket": re.compile(
-        r'^transition ticket ([A-Z][A-Z0-9]+-\d+) to "(.+?)"$',
+        rf'^transition ticket ({_TICKET_KEY}) to "(.+?)"$',
         re.IGNORECASE,
     ),
     # assign ticket ESD-1 to "john.doe"
     "assign_ticket": re.compile(
-        r'^assign ticket ([A-Z][A-Z0-9]+-\d+) to "(.+?)"$',
+        rf'^assign ticket ({_TICKET_KEY}) to "(.+?)"$',
         re.IGNORECASE,
     ),
     # comment on ticket ESD-1 "this is a comment"
     "add_comment": re.compile(
-        r'^comment on ticket ([A-Z][A-Z0-9]+-\d+) "(.+?)"$',
+        rf'^comment on ticket ({_TICKET_KEY}) "(.+?)"$',
         re.IGNORECASE,
     ),
 
     # APPROVAL COMMANDS
-    "approve": re.compile(r'^approve ([0-9a-f-]+)$', re.IGNORECASE),
+    # approve <id> / approve <id> <id> ... (several at once)
+    "approve": re.compile(r'^approve ([0-9a-f-]+(?:[\s,]+[0-9a-f-]+)*)$', re.IGNORECASE),
     "reject": re.compile(r'^reject ([0-9a-f-]+)$', re.IGNORECASE),
 }
 
@@ -85,13 +100,14 @@ PATTERNS = {
 # ---------------------------------------------------------
 class AgentState(TypedDict):
     """State schema for the Jira agent workflow with approvals."""
-    messages: Annotated[list, operator.add]
+    messages: Annotated[list, add_messages]  # append by message id, so replays don't duplicate
 
-    greeted: bool
     status_filter: str | None
-    ticket_to_summarize: str | None
+    ticket_to_summarize: list[str] | str | None  # a bare str is accepted for back-compat
 
     pending_approval_id: str | None
+    approved_request_ids: list[str] | None  # set when several requests are approved at once
+    next_node: str  # where route_after_agent sends this turn; set by agent_node
     operation_type: str | None  # create_ticket, update_ticket, transition_ticket, assign_ticket, add_comment
 
     # extra fields used by approval_node
@@ -106,385 +122,470 @@ class AgentState(TypedDict):
     update_value: str | None
 
 
+# Per-turn fields. Every turn enters at agent_node, which resets all of them,
+# so the nodes after it only return the keys they actually change.
+_TURN_FIELDS = (
+    ("status_filter", None),
+    ("ticket_to_summarize", None),
+    ("pending_approval_id", None),
+    ("approved_request_ids", None),
+    ("operation_type", None),
+    # arguments of the previous write command
+    ("target_ticket_key", None),
+    ("target_status", None),
+    ("assignee", None),
+    ("comment_body", None),
+    ("project_key", None),
+    ("summary", None),
+    ("description", None),
+    ("update_field", None),
+    ("update_value", None),
+)
+
+
+def _turn_update(state: AgentState, **overrides):
+    """Build agent_node's return value: reset per-turn fields, apply overrides.
+
+    Only fields that currently hold a value are written back, so a turn that
+    follows a clean one touches just the channels it sets.
+    """
+    update = {key: default for key, default in _TURN_FIELDS if state.get(key) is not None}
+    update.update(overrides)
+    return update
+
+
 # ---------------------------------------------------------
 # Agent node: parse canonical commands
 # ---------------------------------------------------------
-def agent_node(state: AgentState):
+# Each handler receives the fullmatch of its pattern and returns the fields
+# this turn sets on top of the clean base state, including "next_node" unless
+# the turn ends here.
+
+def _approve_command(m):
+    request_ids = list(dict.fromkeys(_ID_SEPARATOR_RE.split(m.group(1).lower())))
+    logger.info("Detected approve command for request_id(s)=%s", ", ".join(request_ids))
+
+    # Mark requests as approved; malformed IDs can't exist, so skip the lookup
+    approvals = [
+        approval_manager.approve(rid, approved_by="user") if _APPROVAL_ID_RE.fullmatch(rid) else None
+        for rid in request_ids
+    ]
+    approved = [a.request_id for a in approvals if a is not None]
+    missing = [rid for rid, a in zip(request_ids, approvals) if a is None]
+    messages = [
+        AIMessage(content=f"❌ Approval request {rid} not found or already processed.")
+        for rid in missing
+    ]
+    if not approved:
+        logger.warning("Approval request(s) %s not found", ", ".join(missing))
+        return {"messages": messages}
+
+    # Routing keys off the first request's operation; execute_node looks up
+    # the rest itself
+    op_type = next(a for a in approvals if a is not None).operation_type
+
+    messages.append(AIMessage(
+        content=f"✅ Request {approved[0]} approved. Executing operation..." if len(approved) == 1
+        else f"✅ Requests {', '.join(approved)} approved. Executing operations..."
+    ))
+    return {
+        "messages": messages,
+        "pending_approval_id": approved[0],
+        "approved_request_ids": approved,
+        "operation_type": op_type,
+        "next_node": "execute",
+    }
+
+
+def _reject_command(m):
+    request_id = m.group(1).lower()
+    logger.info("Detected reject command for request_id=%s", request_id)
+
+    if _APPROVAL_ID_RE.fullmatch(request_id) and approval_manager.reject(
+        request_id, reason="Rejected from chat", rejected_by="user"
+    ):
+        return {
+            "messages": [AIMessage(content=f"❌ Operation cancelled. Approval request {request_id} has been rejected.")],
+        }
+    return {
+        "messages": [AIMessage(content=f"❌ Approval request {request_id} not found or already processed.")],
+    }
+
+
+def _show_my_tickets_command(m):
+    logger.info("Matched: show my tickets")
+    return {
+        "messages": [AIMessage(content="Fetching all tickets assigned to or reported by you...")],
+        "next_node": "tools",
+    }
+
+
+def _show_tickets_status_command(m):
+    status = m.group(1).strip()
+    logger.info("Matched: show tickets with status '%s'", status)
+    return {
+        "messages": [AIMessage(content=f"Fetching your tickets with status '{status}'...")],
+        "status_filter": status,
+        "next_node": "tools",
+    }
+
+
+def _summarize_ticket_command(m):
+    # Keep first-seen order but drop repeats so each ticket is fetched once
+    ticket_keys = list(dict.fromkeys(k.upper() for k in _TICKET_KEY_RE.findall(m.group(1))))
+    logger.info("Matched: summarize ticket(s) %s", ", ".join(ticket_keys))
+    label = "ticket" if len(ticket_keys) == 1 else "tickets"
+    return {
+        "messages": [AIMessage(content=f"Summarizing {label} {', '.join(ticket_keys)}...")],
+        "ticket_to_summarize": ticket_keys,
+        "next_node": "summarizer",
+    }
+
+
+def _create_ticket_command(m):
+    project_key, summary, description = m.groups()
+    project_key = project_key.upper()
+    logger.info("Matched: create ticket in %s", project_key)
+    return {
+        "messages": [AIMessage(
+            content=f"Preparing to create a ticket in project {project_key} "
+                    f"with summary '{summary}'. I will show you a preview for approval."
+        )],
+        "operation_type": "create_ticket",
+        "project_key": project_key,
+        "summary": summary,
+        "description": description,
+        "next_node": "approval",
+    }
+
+
+def _update_ticket_command(m):
+    ticket_key, field, value = m.groups()
+    ticket_key = ticket_key.upper()
+    field = field.lower()
+    logger.info("Matched: update ticket %s set %s", ticket_key, field)
+    return {
+        "messages": [AIMessage(
+            content=f"Preparing to update ticket {ticket_key}: set {field} to '{value}'. "
+                    f"I will show you a preview for approval."
+        )],
+        "operation_type": "update_ticket",
+        "target_ticket_key": ticket_key,
+        "update_field": field,
+        "update_value": value,
+        "next_node": "approval",
+    }
+
+
+def _transition_ticket_command(m):
+    ticket_key, status = m.groups()
+    ticket_key = ticket_key.upper()
+    status = status.strip()
+    logger.info("Matched: transition ticket %s to '%s'", ticket_key, status)
+    return {
+        "messages": [AIMessage(
+            content=f"Preparing to transition ticket {ticket_key} to '{status}'. "
+                    f"I will show you a preview for approval."
+        )],
+        "operation_type": "transition_ticket",
+        "target_ticket_key": ticket_key,
+        "target_status": status,
+        "next_node": "approval",
+    }
+
+
+def _assign_ticket_command(m):
+    ticket_key, assignee = m.groups()
+    ticket_key = ticket_key.upper()
+    assignee = assignee.strip()
+    logger.info("Matched: assign ticket %s to '%s'", ticket_key, assignee)
+    return {
+        "messages": [AIMessage(
+            content=f"Preparing to assign ticket {ticket_key} to '{assignee}'. "
+                    f"I will show you a preview for approval."
+        )],
+        "operation_type": "assign_ticket",
+        "target_ticket_key": ticket_key,
+        "assignee": assignee,
+        "next_node": "approval",
+    }
+
+
+def _add_comment_command(m):
+    ticket_key, comment_body = m.groups()
+    ticket_key = ticket_key.upper()
+    logger.info("Matched: add comment to ticket %s", ticket_key)
+    return {
+        "messages": [AIMessage(
+            content=f"Preparing to add a comment to ticket {ticket_key}. "
+                    f"I will show you a preview for approval."
+        )],
+        "operation_type": "add_comment",
+        "target_ticket_key": ticket_key,
+        "comment_body": comment_body,
+        "next_node": "approval",
+    }
+
+
+# Every canonical command starts with a fixed verb, so dispatch on the first
+# word and only try the patterns that can match. Free-form messages for the
+# LLM fall through with a single dict lookup and no regex work.
+COMMANDS_BY_VERB = {
+    # APPROVAL COMMANDS
+    "approve": (("approve", _approve_command),),
+    "reject": (("reject", _reject_command),),
+    # READ
+    "show": (
+        ("show_my_tickets", _show_my_tickets_command),
+        ("show_tickets_status", _show_tickets_status_command),
+    ),
+    "summarize": (("summarize_ticket", _summarize_ticket_command),),
+    # WRITE (approval required)
+    "create": (("create_ticket", _create_ticket_command),),
+    "update": (("update_ticket", _update_ticket_command),),
+    "transition": (("transition_ticket", _transition_ticket_command),),
+    "assign": (("assign_ticket", _assign_ticket_command),),
+    "comment": (("add_comment", _add_comment_command),),
+}
+
+
+async def agent_node(state: AgentState):
     """
     Process user input and determine the next action.
     Uses STRICT, regex-based matching on canonical commands.
     """
     logger.info("Executing agent_node")
 
+    # Only the message that started this turn matters. The checkpointed history
+    # grows every turn, so don't walk it, and never act on an older message.
     messages = state["messages"]
-    human_messages = [m for m in messages if isinstance(m, HumanMessage) and str(m.content).strip()]
+    last_msg = messages[-1] if messages else None
+    last_msg_raw = str(last_msg.content or "").strip() if isinstance(last_msg, HumanMessage) else ""
 
-    if not human_messages:
+    if not last_msg_raw:
         logger.warning("No human message found - cannot proceed without human input")
-        return {
-            "messages": [AIMessage(content="I need a human message to proceed. Please provide instructions.")],
-            "greeted": state.get("greeted", False),
-            "status_filter": None,
-            "ticket_to_summarize": None,
-            "pending_approval_id": None,
-            "operation_type": None,
-        }
-
-    last_msg_raw = str(messages[-1].content or "").strip()
-    logger.info("Last user message: %s", last_msg_raw)
-
-    # Helper to build a clean base state for this turn
-    def base_state(extra: dict):
-        base = {
-            "greeted": state.get("greeted", False),
-            "status_filter": None,
-            "ticket_to_summarize": None,
-            "pending_approval_id": None,
-            "operation_type": None,
-            "target_ticket_key": None,
-            "target_status": None,
-            "assignee": None,
-            "comment_body": None,
-            "project_key": None,
-            "summary": None,
-            "description": None,
-            "update_field": None,
-            "update_value": None,
-        }
-        base.update(extra)
-        return base
-
-    # --------------------------------------------------
-    # 1) APPROVAL COMMANDS
-    # --------------------------------------------------
-    m = PATTERNS["approve"].fullmatch(last_msg_raw)
-    if m:
-        request_id = m.group(1)
-        logger.info("Detected approve command for request_id=%s", request_id)
-
-        # Mark request as approved
-        if not approval_manager.approve(request_id, approved_by="user"):
-            logger.warning("Approval request %s not found", request_id)
-            return base_state({
-                "messages": [AIMessage(content=f"❌ Approval request {request_id} not found or already processed.")],
-            })
-
-        # Find which operation this request corresponds to
-        approval = approval_manager.get_approval(request_id) or next(
-            (a for a in approval_manager.approval_history if a.request_id == request_id),
-            None,
+        return _turn_update(
+            state,
+            messages=[AIMessage(content="I need a human message to proceed. Please provide instructions.")],
+            next_node=END,
         )
-        op_type = approval.operation_type if approval else None
-
-        return base_state({
-            "messages": [AIMessage(content=f"✅ Request {request_id} approved. Executing operation...")],
-            "pending_approval_id": request_id,
-            "operation_type": op_type,
-        })
-
-    m = PATTERNS["reject"].fullmatch(last_msg_raw)
-    if m:
-        request_id = m.group(1)
-        logger.info("Detected reject command for request_id=%s", request_id)
-
-        if approval_manager.reject(request_id, reason="Rejected from chat", rejected_by="user"):
-            return base_state({
-                "messages": [AIMessage(content=f"❌ Operation cancelled. Approval request {request_id} has been rejected.")],
-            })
-        else:
-            return base_state({
-                "messages": [AIMessage(content=f"❌ Approval request {request_id} not found or already processed.")],
-            })
 
-    # --------------------------------------------------
-    # 2) READ OPERATIONS (no approval)
-    # --------------------------------------------------
-    if PATTERNS["show_my_tickets"].fullmatch(last_msg_raw):
-        logger.info("Matched: show my tickets")
-        return base_state({
-            "messages": [AIMessage(content="Fetching all tickets assigned to or reported by you...")],
-            "greeted": True,
-        })
-
-    m = PATTERNS["show_tickets_status"].fullmatch(last_msg_raw)
-    if m:
-        status = m.group(1).strip()
-        logger.info("Matched: show tickets with status '%s'", status)
-        return base_state({
-            "messages": [AIMessage(content=f"Fetching your tickets with status '{status}'...")],
-            "greeted": True,
-            "status_filter": status,
-        })
-
-    m = PATTERNS["summarize_ticket"].fullmatch(last_msg_raw)
-    if m:
-        ticket_key = m.group(1).upper()
-        logger.info("Matched: summarize ticket %s", ticket_key)
-        return base_state({
-            "messages": [AIMessage(content=f"Summarizing ticket {ticket_key}...")],
-            "ticket_to_summarize": ticket_key,
-        })
+    logger.info("Last user message: %s", last_msg_raw)
 
     # --------------------------------------------------
-    # 3) WRITE OPERATIONS (approval required)
+    # 1) CANONICAL COMMANDS (approval, read, write)
     # --------------------------------------------------
-    m = PATTERNS["create_ticket"].fullmatch(last_msg_raw)
-    if m:
-        project_key, summary, description = m.groups()
-        project_key = project_key.upper()
-        logger.info("Matched: create ticket in %s", project_key)
-        return base_state({
-            "messages": [AIMessage(
-                content=f"Preparing to create a ticket in project {project_key} "
-                        f"with summary '{summary}'. I will show you a preview for approval."
-            )],
-            "operation_type": "create_ticket",
-            "project_key": project_key,
-            "summary": summary,
-            "description": description,
-        })
-
-    m = PATTERNS["update_ticket"].fullmatch(last_msg_raw)
-    if m:
-        ticket_key, field, value = m.groups()
-        ticket_key = ticket_key.upper()
-        field = field.lower()
-        logger.info("Matched: update ticket %s set %s", ticket_key, field)
-        return base_state({
-            "messages": [AIMessage(
-                content=f"Preparing to update ticket {ticket_key}: set {field} to '{value}'. "
-                        f"I will show you a preview for approval."
-            )],
-            "operation_type": "update_ticket",
-            "target_ticket_key": ticket_key,
-            "update_field": field,
-            "update_value": value,
-        })
-
-    m = PATTERNS["transition_ticket"].fullmatch(last_msg_raw)
-    if m:
-        ticket_key, status = m.groups()
-        ticket_key = ticket_key.upper()
-        status = status.strip()
-        logger.info("Matched: transition ticket %s to '%s'", ticket_key, status)
-        return base_state({
-            "messages": [AIMessage(
-                content=f"Preparing to transition ticket {ticket_key} to '{status}'. "
-                        f"I will show you a preview for approval."
-            )],
-            "operation_type": "transition_ticket",
-            "target_ticket_key": ticket_key,
-            "target_status": status,
-        })
-
-    m = PATTERNS["assign_ticket"].fullmatch(last_msg_raw)
-    if m:
-        ticket_key, assignee = m.groups()
-        ticket_key = ticket_key.upper()
-        assignee = assignee.strip()
-        logger.info("Matched: assign ticket %s to '%s'", ticket_key, assignee)
-        return base_state({
-            "messages": [AIMessage(
-                content=f"Preparing to assign ticket {ticket_key} to '{assignee}'. "
-                        f"I will show you a preview for approval."
-            )],
-            "operation_type": "assign_ticket",
-            "target_ticket_key": ticket_key,
-            "assignee": assignee,
-        })
-
-    m = PATTERNS["add_comment"].fullmatch(last_msg_raw)
-    if m:
-        ticket_key, comment_body = m.groups()
-        ticket_key = ticket_key.upper()
-        logger.info("Matched: add comment to ticket %s", ticket_key)
-        return base_state({
-            "messages": [AIMessage(
-                content=f"Preparing to add a comment to ticket {ticket_key}. "
-                        f"I will show you a preview for approval."
-            )],
-            "operation_type": "add_comment",
-            "target_ticket_key": ticket_key,
-            "comment_body": comment_body,
-        })
+    verb = last_msg_raw.split(None, 1)[0].lower() if last_msg_raw else ""
+    for pattern_name, handler in COMMANDS_BY_VERB.get(verb, ()):
+        m = PATTERNS[pattern_name].fullmatch(last_msg_raw)
+        if m:
+            return _turn_update(state, **{"next_node": END, **handler(m)})
 
     # --------------------------------------------------
-    # 4) FALLBACK TO LLM (general Q&A, etc.)
+    # 2) FALLBACK TO LLM (general Q&A, etc.)
     # --------------------------------------------------
     logger.info("No canonical command matched. Falling back to LLM.")
-    response = llm.invoke(human_messages)
-    return base_state({
-        "messages": [response],
-    })
+    # Stream tokens to callers using stream_mode="custom" as they arrive;
+    # the writer is a no-op for plain invoke/ainvoke
+    writer = get_stream_writer()
+    response = None
+    async for chunk in LLMConfig.get_llm().astream([last_msg]):
+        writer({"token": chunk.content})
+        response = chunk if response is None else response + chunk
+    response = message_chunk_to_message(response) if response is not None else AIMessage(content="")
+    return _turn_update(state, messages=[response], next_node=END)
 
 
 # ---------------------------------------------------------
 # Read-only tool node
 # ---------------------------------------------------------
-def tool_node(state: AgentState):
+async def tool_node(state: AgentState):
     """Fetch tickets based on the status filter (read-only)."""
     logger.info("Executing tool_node")
     status = state.get("status_filter")
 
-    tickets_text = fetch_tickets_by_status(status)
-    return {
-        "messages": [AIMessage(content=tickets_text)],
-        "greeted": False,
-        "status_filter": None,
-        "ticket_to_summarize": None,
-        "pending_approval_id": state.get("pending_approval_id"),
-        "operation_type": state.get("operation_type"),
-    }
+    # The Jira client is synchronous; keep the event loop free while it runs
+    tickets_text = await asyncio.to_thread(fetch_tickets_by_status, status)
+    return {"messages": [AIMessage(content=tickets_text)]}
 
 
 # ---------------------------------------------------------
 # Summarize ticket
 # ---------------------------------------------------------
-def summarize_ticket_node(state: AgentState):
-    """Summarize a specific ticket (read-only)."""
+async def summarize_ticket_node(state: AgentState):
+    """Summarize one or more tickets (read-only), fetching them concurrently."""
     logger.info("Executing summarize_ticket_node")
-    ticket_key = state.get("ticket_to_summarize")
-    if not ticket_key:
-        return state
+    ticket_keys = state.get("ticket_to_summarize")
+    if not ticket_keys:
+        return {}
+    if isinstance(ticket_keys, str):
+        ticket_keys = [ticket_keys]
 
-    summary = fetch_and_summarize_ticket(ticket_key)
-    return {
-        "messages": [AIMessage(content=summary)],
-        "greeted": state.get("greeted", False),
-        "status_filter": None,
-        "ticket_to_summarize": None,
-        "pending_approval_id": state.get("pending_approval_id"),
-        "operation_type": state.get("operation_type"),
-    }
+    # The Jira client is synchronous; run each fetch in a worker thread and
+    # cap how many hit Jira at once
+    semaphore = asyncio.Semaphore(settings.JIRA_FETCH_CONCURRENCY)
+
+    async def summarize(ticket_key: str) -> str:
+        async with semaphore:
+            return await asyncio.to_thread(fetch_and_summarize_ticket, ticket_key)
+
+    summaries = await asyncio.gather(*(summarize(k) for k in ticket_keys))
+    return {"messages": [AIMessage(content=summary) for summary in summaries]}
 
 
 # ---------------------------------------------------------
 # Approval node: create preview & approval request
 # ---------------------------------------------------------
+# Each builder turns the parsed command in state into an approval request
+
+def _request_create_ticket(state: AgentState):
+    return create_ticket_with_approval(
+        project_key=state.get("project_key"),
+        summary=state.get("summary"),
+        description=state.get("description") or "",
+        issue_type="Task",
+    )
+
+
+def _request_update_ticket(state: AgentState):
+    field = state.get("update_field")
+    value = state.get("update_value")
+
+    kwargs = {}
+    if field in ("summary", "description", "assignee", "priority"):
+        kwargs[field] = value
+    elif field == "labels":
+        # labels "a,b,c"
+        kwargs["labels"] = [v.strip() for v in value.split(",") if v.strip()]
+
+    return update_ticket_with_approval(state.get("target_ticket_key"), **kwargs)
+
+
+def _request_transition_ticket(state: AgentState):
+    return transition_ticket_with_approval(state.get("target_ticket_key"), state.get("target_status"))
+
+
+def _request_assign_ticket(state: AgentState):
+    return assign_ticket_with_approval(state.get("target_ticket_key"), state.get("assignee"))
+
+
+def _request_add_comment(state: AgentState):
+    return add_comment_with_approval(state.get("target_ticket_key"), state.get("comment_body") or "")
+
+
+_APPROVAL_REQUESTS = {
+    "create_ticket": _request_create_ticket,
+    "update_ticket": _request_update_ticket,
+    "transition_ticket": _request_transition_ticket,
+    "assign_ticket": _request_assign_ticket,
+    "add_comment": _request_add_comment,
+}
+
+
 def approval_node(state: AgentState):
     """Create approval request and show preview."""
     logger.info("Executing approval_node")
-    op_type = state.get("operation_type")
-
-    if not op_type:
-        return state
-
-    if op_type == "create_ticket":
-        project_key = state.get("project_key")
-        summary = state.get("summary")
-        description = state.get("description") or ""
-        approval = create_ticket_with_approval(
-            project_key=project_key,
-            summary=summary,
-            description=description,
-            issue_type="Task",
-        )
-
-    elif op_type == "update_ticket":
-        ticket_key = state.get("target_ticket_key")
-        field = state.get("update_field")
-        value = state.get("update_value")
-
-        kwargs = {}
-        if field == "summary":
-            kwargs["summary"] = value
-        elif field == "description":
-            kwargs["description"] = value
-        elif field == "assignee":
-            kwargs["assignee"] = value
-        elif field == "priority":
-            kwargs["priority"] = value
-        elif field == "labels":
-            # labels "a,b,c"
-            kwargs["labels"] = [v.strip() for v in value.split(",") if v.strip()]
-
-        approval = update_ticket_with_approval(ticket_key, **kwargs)
-
-    elif op_type == "transition_ticket":
-        ticket_key = state.get("target_ticket_key")
-        target_status = state.get("target_status")
-        approval = transition_ticket_with_approval(ticket_key, target_status)
-
-    elif op_type == "assign_ticket":
-        ticket_key = state.get("target_ticket_key")
-        assignee = state.get("assignee")
-        approval = assign_ticket_with_approval(ticket_key, assignee)
-
-    elif op_type == "add_comment":
-        ticket_key = state.get("target_ticket_key")
-        comment_body = state.get("comment_body") or ""
-        approval = add_comment_with_approval(ticket_key, comment_body)
-
-    else:
-        return state
+    build_request = _APPROVAL_REQUESTS.get(state.get("operation_type"))
+    if build_request is None:
+        return {}
 
+    approval = build_request(state)
     approval_msg = approval_manager.format_approval_message(approval)
     return {
         "messages": [AIMessage(content=approval_msg)],
-        "greeted": state.get("greeted", False),
-        "status_filter": None,
-        "ticket_to_summarize": None,
         "pending_approval_id": approval.request_id,
-        "operation_type": op_type,
     }
 
 
 # ---------------------------------------------------------
 # Execute node: run approved operation
 # ---------------------------------------------------------
-def execute_node(state: AgentState):
-    """Execute approved operation."""
+# op_type -> success message; "{}" receives the executor's result
+_SUCCESS_MESSAGES = {
+    "create_ticket": "✅ Ticket created successfully: {}",
+    "update_ticket": "✅ Ticket updated successfully.",
+    "transition_ticket": "✅ Ticket transitioned successfully.",
+    "assign_ticket": "✅ Ticket assigned successfully.",
+    "add_comment": "✅ Comment added successfully.",
+}
+
+
+def _execute_one(approval_id: str, op_type: str) -> str:
+    """Run one approved operation and return the message to show."""
+    executor = EXECUTORS.get(op_type)
+    if executor is None:
+        return "Unknown operation type; nothing executed."
+    return _SUCCESS_MESSAGES[op_type].format(executor(approval_id))
+
+
+def _execute_creates(approval_ids: list[str]) -> dict[str, str]:
+    """Create tickets for several approved requests in one bulk call; returns {approval_id: message}."""
+    messages = {}
+    for approval_id, result in zip(approval_ids, execute_create_tickets(approval_ids)):
+        if result["key"]:
+            messages[approval_id] = f"✅ Ticket created successfully: {result['key']}"
+        else:
+            messages[approval_id] = f"❌ Error executing operation {approval_id}: {result['error']}"
+    return messages
+
+
+async def execute_node(state: AgentState):
+    """Execute approved operation(s)."""
     logger.info("Executing execute_node")
     approval_id = state.get("pending_approval_id")
     op_type = state.get("operation_type")
 
     if not approval_id or not op_type:
-        return {
-            "messages": [AIMessage(content="No pending operation to execute.")],
-            "greeted": state.get("greeted", False),
-            "status_filter": None,
-            "ticket_to_summarize": None,
-            "pending_approval_id": None,
-            "operation_type": None,
-        }
-
-    try:
-        if op_type == "create_ticket":
-            ticket_key = execute_create_ticket(approval_id)
-            msg = f"✅ Ticket created successfully: {ticket_key}"
-        elif op_type == "update_ticket":
-            execute_update_ticket(approval_id)
-            msg = "✅ Ticket updated successfully."
-        elif op_type == "transition_ticket":
-            execute_transition_ticket(approval_id)
-            msg = "✅ Ticket transitioned successfully."
-        elif op_type == "assign_ticket":
-            execute_assign_ticket(approval_id)
-            msg = "✅ Ticket assigned successfully."
-        elif op_type == "add_comment":
-            execute_add_comment(approval_id)
-            msg = "✅ Comment added successfully."
-        else:
-            msg = "Unknown operation type; nothing executed."
-
-        return {
-            "messages": [AIMessage(content=msg)],
-            "greeted": state.get("greeted", False),
-            "status_filter": None,
-            "ticket_to_summarize": None,
-            "pending_approval_id": None,
-            "operation_type": None,
-        }
-    except Exception as e:
-        logger.exception("Error executing operation for approval_id=%s", approval_id)
-        return {
-            "messages": [AIMessage(content=f"❌ Error executing operation: {str(e)}")],
-            "greeted": state.get("greeted", False),
-            "status_filter": None,
-            "ticket_to_summarize": None,
-            "pending_approval_id": None,
-            "operation_type": None,
-        }
+        return {"messages": [AIMessage(content="No pending operation to execute.")]}
+
+    approval_ids = state.get("approved_request_ids") or [approval_id]
+    if len(approval_ids) == 1:
+        try:
+            msg = await asyncio.to_thread(_execute_one, approval_id, op_type)
+            return {"messages": [AIMessage(content=msg)]}
+        except Exception as e:
+            logger.exception("Error executing operation for approval_id=%s", approval_id)
+            return {"messages": [AIMessage(content=f"❌ Error executing operation: {str(e)}")]}
+
+    # Several approvals: ticket creations share one bulk request. Other
+    # operations on the same ticket run one after another in approval order,
+    # while different tickets run concurrently. A failure doesn't stop the
+    # remaining operations, and messages come back in approval order.
+    ops = [(aid, approval_manager.find(aid)) for aid in approval_ids]
+    creates = [aid for aid, approval in ops if approval and approval.operation_type == "create_ticket"]
+    by_ticket = {}
+    for aid, approval in ops:
+        if aid not in creates:
+            ticket_key = approval.ticket_key.upper() if approval and approval.ticket_key else aid
+            by_ticket.setdefault(ticket_key, []).append((aid, approval))
+    semaphore = asyncio.Semaphore(settings.JIRA_FETCH_CONCURRENCY)
+    messages = {}
+
+    async def create_all() -> None:
+        try:
+            messages.update(await asyncio.to_thread(_execute_creates, creates))
+        except Exception as e:
+            logger.exception("Error bulk creating tickets for approval_ids=%s", creates)
+            for aid in creates:
+                messages[aid] = f"❌ Error executing operation {aid}: {str(e)}"
+
+    async def execute_in_order(ticket_ops) -> None:
+        async with semaphore:
+            for aid, approval in ticket_ops:
+                try:
+                    messages[aid] = await asyncio.to_thread(
+                        _execute_one, aid, approval.operation_type if approval else None
+                    )
+                except Exception as e:
+                    logger.exception("Error executing operation for approval_id=%s", aid)
+                    messages[aid] = f"❌ Error executing operation {aid}: {str(e)}"
+
+    await asyncio.gather(
+        *([create_all()] if creates else []),
+        *(execute_in_order(ticket_ops) for ticket_ops in by_ticket.values()),
+    )
+
+    return {"messages": [AIMessage(content=messages[aid]) for aid in approval_ids]}
 
 
 # ---------------------------------------------------------
@@ -493,6 +594,8 @@ def execute_node(state: AgentState):
 logger.info("Setting up workflow graph with approval workflow")
 workflow = StateGraph(state_schema=AgentState)
 workflow.add_node("agent", agent_node)
+# Ticket lists are cached in jira_tool, where writes clear them, and summaries
+# are keyed on the ticket's updated time, so no node needs a cache policy.
 workflow.add_node("tools", tool_node)
 workflow.add_node("summarizer", summarize_ticket_node)
 workflow.add_node("approval", approval_node)
@@ -501,28 +604,8 @@ workflow.set_entry_point("agent")
 
 
 def route_after_agent(state: AgentState):
-    """Route after agent node based on state."""
-    approval_id = state.get("pending_approval_id")
-    op_type = state.get("operation_type")
-
-    # Write: have op_type but no approval yet → create preview
-    if op_type and not approval_id:
-        return "approval"
-
-    # Have approval id + op type:
-    # if approved → execute, otherwise wait
-    if approval_id and op_type:
-        if approval_manager.is_approved(approval_id):
-            return "execute"
-        return END
-
-    # Read-only paths
-    if state.get("status_filter") is not None or state.get("greeted", False):
-        return "tools"
-    if state.get("ticket_to_summarize"):
-        return "summarizer"
-
-    return END
+    """Route after agent node; agent_node has already decided where to go."""
+    return state.get("next_node", END)
 
 
 workflow.add_conditional_edges(
@@ -543,5 +626,19 @@ workflow.add_edge("approval", END)
 workflow.add_edge("execute", END)
 
 logger.info("Compiling workflow graph with approval workflow")
-app = workflow.compile()
+# State is checkpointed per thread, so callers only send the new message
+app = workflow.compile(checkpointer=MemorySaver())
 logger.info("Workflow graph compiled successfully")
+
+
+def thread_config(thread_id: str) -> dict:
+    """Invocation config selecting the checkpointed conversation ``thread_id``."""
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def latest_ai_messages(messages: list) -> list:
+    """Return the AI messages produced after the most recent human message."""
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            return [m for m in messages[i + 1:] if isinstance(m, AIMessage)]
+    return [m for m in messages if isinstance(m, AIMessage)]
@@ -1,13 +1,49 @@
-
+import asyncio
 import logging
-from graphs.jira_agent_graph import app
-from langchain_core.messages import HumanMessage, AIMessage
-from models.llm_config import LLMConfig
-from approval.approval_manager import approval_manager
+import os
+import sys
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
-def run_agent():
+TOKEN_FLUSH_INTERVAL = 0.05  # Seconds of streamed tokens coalesced into one write
+
+def _warm_up():
+    """Import the graph (LangChain, LangGraph, jira) and create the LLM client."""
+    from graphs import jira_agent_graph  # noqa: F401
+    from models.llm_config import LLMConfig
+    LLMConfig.get_llm()
+
+async def _read_input(prompt: str) -> str:
+    """
+    input() on a daemon thread. asyncio.to_thread would use the default
+    executor, which asyncio.run joins on shutdown, so Ctrl+C at the prompt
+    would hang until Enter was pressed.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result=None, error=None):
+        if future.done():  # Cancelled by Ctrl+C while we were blocked
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def read():
+        try:
+            line = input(prompt)
+        except Exception as e:  # EOFError once piped input runs out
+            loop.call_soon_threadsafe(resolve, None, e)
+        else:
+            loop.call_soon_threadsafe(resolve, line)
+
+    threading.Thread(target=read, name="cli-input", daemon=True).start()
+    return await future
+
+async def run_agent():
     logger.info("run_agent called")
     print("=" * 60)
     print("JIRA Agent with Human Approval Required")
@@ -19,6 +55,7 @@ def run_agent():
     print('  - show my tickets')
     print('  - show tickets with status In Progress')
     print('  - summarize ticket ESD-123')
+    print('  - summarize tickets ESD-123, ESD-124')
     print()
     print("WRITE (approval required):")
     print('  - create ticket in ESD summary "Title" description "Body"')
@@ -29,24 +66,24 @@ def run_agent():
     print('  - comment on ticket ESD-123 "This is a comment"')
     print()
     print("APPROVAL:")
-    print('  - approve <request_id>')
+    print('  - approve <request_id> [<request_id> ...]')
     print('  - reject <request_id>')
     print("=" * 60)
     print()
     
-    # Initialize state
-    current_state = {
-        "messages": [],
-        "greeted": False,
-        "status_filter": None,
-        "ticket_to_summarize": None,
-        "pending_approval_id": None,
-        "operation_type": None
-    }
-    
+    # The heavy imports take seconds; load them while the user types the
+    # first command instead of before the banner
+    warm_up = asyncio.create_task(asyncio.to_thread(_warm_up))
+
     while True:
         # STRICT: Require human message to proceed
-        user_input = input("\nYou: ").strip()
+        try:
+            user_input = (await _read_input("\nYou: ")).strip()
+        except EOFError:
+            # Piped input has run out; same as typing "exit"
+            logger.info("End of input, exiting agent loop.")
+            print()
+            break
         logger.info("User input: %s", user_input)
         
         if not user_input:
@@ -59,36 +96,47 @@ def run_agent():
             print("Exiting agent.")
             break
 
-        # Prepare input state for the workflow
-        input_state = {
-            **current_state,
-            "messages": [HumanMessage(content=user_input)]
-        }
-
         # Invoke the LangGraph workflow
         try:
+            await warm_up
+            from graphs.jira_agent_graph import app, latest_ai_messages, thread_config
+            from langchain_core.messages import HumanMessage
+            from approval.approval_manager import approval_manager
+
+            # Only the new message is sent; the rest comes from the checkpoint,
+            # where conversation state lives under the "cli" thread
+            config = thread_config("cli")
+            input_state = {"messages": [HumanMessage(content=user_input)]}
+
             logger.info("Invoking LangGraph workflow with input_state: %s", input_state)
-            result = app.invoke(input_state)
-            logger.info("LangGraph workflow completed")
-            # Update state
-            current_state = {
-                "messages": result.get("messages", []),
-                "greeted": result.get("greeted", False),
-                "status_filter": result.get("status_filter"),
-                "ticket_to_summarize": result.get("ticket_to_summarize"),
-                "pending_approval_id": result.get("pending_approval_id"),
-                "operation_type": result.get("operation_type")
-            }
-            # Print AI responses
-            for msg in result.get("messages", []):
-                if isinstance(msg, AIMessage):
-                    logger.info("AI response: %s", msg.content)
-                    print(f"\n ** AI: {msg.content} **")
-            # Show pending approvals
+            # LLM replies arrive token by token on the "custom" stream; node
+            # results come from the final "values" snapshot
+            result = {}
+            streamed = False
+            tokens = []
+            last_flush = time.monotonic()
+            async for mode, chunk in app.astream(input_state, config=config, stream_mode=["custom", "values"]):
+                if mode == "values":
+                    result = chunk
+                elif "token" in chunk:
+                    if not streamed:
+                        tokens.append("\n ** AI: ")
+                        streamed = True
+                    tokens.append(chunk["token"])
+                    if time.monotonic() - last_flush >= TOKEN_FLUSH_INTERVAL:
+                        sys.stdout.write("".join(tokens))
+                        sys.stdout.flush()
+                        tokens.clear()
+                        last_flush = time.monotonic()
+            # Collect the rest of the turn's output and write it in one go
+            responses = latest_ai_messages(result.get("messages", []))
             pending = approval_manager.get_pending_approvals()
+            out = tokens + [" **\n"] if streamed else [f"\n ** AI: {msg.content} **\n" for msg in responses]
             if pending:
-                logger.info("%d pending approvals found.", len(pending))
-                print(f"\n ** You have {len(pending)} pending approval(s). Review and approve/reject them. **")
+                out.append(f"\n ** You have {len(pending)} pending approval(s). Review and approve/reject them. **\n")
+            sys.stdout.write("".join(out))
+            sys.stdout.flush()
+            logger.info("LangGraph workflow completed: %d response(s), %d pending approval(s)", len(responses), len(pending))
         except Exception as e:
             logger.error("Error in agent loop: %s", str(e))
             print(f"\n ** Error: {str(e)} **")
@@ -97,6 +145,15 @@ def run_agent():
 
 if __name__ == "__main__":
     logger.info("Main execution started.")
-    LLMConfig.get_llm()
-    run_agent()
+    try:
+        asyncio.run(run_agent())
+    except KeyboardInterrupt:
+        logger.info("Interrupted, exiting agent.")
+        print("\nExiting agent.")
+        # The input thread may still be blocked holding stdin's lock, which
+        # aborts normal interpreter shutdown; flush and leave directly
+        logging.shutdown()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(130)
     logger.info("Main execution completed.")
\ No newline at end of file
@@ -1,5 +1,6 @@
 
 import logging
+import threading
 from langchain_google_genai import ChatGoogleGenerativeAI
 from config.settings import settings
 
@@ -8,20 +9,21 @@ logger = logging.getLogger(__name__)
 class LLMConfig:
     _llm_instance = None  # cache singleton
     _initialized = False  # track if we already logged
+    _lock = threading.Lock()  # get_llm runs from the startup warm-up thread and request handlers
 
     @staticmethod
     def get_llm():
-        logger.info("LLMConfig.get_llm called")
         if LLMConfig._llm_instance is None:
-            LLMConfig._llm_instance = ChatGoogleGenerativeAI(
-                model=settings.MODEL_NAME,
-                google_api_key=settings.GOOGLE_API_KEY,
-                temperature=settings.TEMPERATURE
-            )
-            if not LLMConfig._initialized:
-                logger.info("Gemini initialized successfully.")
-                LLMConfig._initialized = True
-        logger.info("LLMConfig.get_llm completed")
+            with LLMConfig._lock:
+                if LLMConfig._llm_instance is None:
+                    LLMConfig._llm_instance = ChatGoogleGenerativeAI(
+                        model=settings.MODEL_NAME,
+                        google_api_key=settings.GOOGLE_API_KEY,
+                        temperature=settings.TEMPERATURE
+                    )
+                    if not LLMConfig._initialized:
+                        logger.info("Gemini initialized successfully.")
+                        LLMConfig._initialized = True
         return LLMConfig._llm_instance
 
     
\ No newline at end of file
@@ -3,13 +3,40 @@ Minimal JIRA operations used by the agent + approval workflow.
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Dict, List, Any
 from jira import JIRA
 from jira.exceptions import JIRAError
-from tools.jira_tool import get_jira_client
+from tools.jira_tool import clear_query_cache, get_jira_client
 
 logger = logging.getLogger(__name__)
 
+# Jira's bulk create endpoint accepts at most this many issues per request
+BULK_CREATE_LIMIT = 50
+
+# Issue key shape, e.g. ESD-123
+TICKET_KEY_PATTERN = r'[A-Z][A-Z0-9]+-\d+'
+
+# Issue fields read by get_ticket_details; everything else is left on the server
+DETAILS_FIELDS = "summary,description,status,assignee,reporter,comment"
+
+DETAILS_CACHE_TTL = 60  # Seconds a get_ticket_details result is reused
+DETAILS_CACHE_SIZE = 1024  # Max tickets kept in the details cache
+
+# ticket_key -> (fetched_at, details), least recently used first. Writes made
+# through this module evict the ticket they touch.
+_details_cache = OrderedDict()
+_details_cache_lock = threading.Lock()
+
+
+def _ticket_changed(ticket_key: str) -> None:
+    """Drop cached data a write to ticket_key may have made stale."""
+    with _details_cache_lock:
+        _details_cache.pop(ticket_key.upper(), None)
+    clear_query_cache()
+
 
 # =====================================================
 # ===============  TICKET CREATION  ===================
@@ -29,18 +56,9 @@ def create_ticket(
 
     try:
         jira = get_jira_client()
-
-        issue_dict = {
-            "project": {"key": project_key},
-            "summary": summary,
-            "description": description or "",
-            "issuetype": {"name": issue_type},
-        }
-
-        if assignee:
-            issue_dict["assignee"] = {"name": assignee}
-
+        issue_dict = _issue_fields(project_key, summary, description, issue_type, assignee)
         issue = jira.create_issue(fields=issue_dict)
+        clear_query_cache()
         logger.info("Created ticket: %s", issue.key)
         return issue.key
 
@@ -49,6 +67,61 @@ def create_ticket(
         raise
 
 
+def create_tickets(tickets: List[Dict[str, Any]]) -> List[Dict[str, Optional[str]]]:
+    """
+    Create several JIRA tickets with Jira's bulk create endpoint.
+
+    Args:
+        tickets: Dicts of create_ticket keyword arguments
+
+    Returns:
+        One {"key", "error"} dict per input ticket, in input order
+    """
+    logger.info("Bulk creating %d tickets", len(tickets))
+
+    try:
+        jira = get_jira_client()
+        field_list = [_issue_fields(**ticket) for ticket in tickets]
+
+        results = []
+        for i in range(0, len(field_list), BULK_CREATE_LIMIT):
+            for result in jira.create_issues(field_list=field_list[i:i + BULK_CREATE_LIMIT]):
+                issue = result.get("issue")
+                results.append({
+                    "key": issue.key if issue is not None else None,
+                    "error": result.get("error"),
+                })
+
+        clear_query_cache()
+        logger.info("Bulk created %d of %d tickets", sum(1 for r in results if r["key"]), len(tickets))
+        return results
+
+    except JIRAError as e:
+        logger.error("Failed to bulk create tickets: %s", e)
+        raise
+
+
+def _issue_fields(
+    project_key: str,
+    summary: str,
+    description: str,
+    issue_type: str = "Task",
+    assignee: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build the create-issue fields payload."""
+    issue_dict = {
+        "project": {"key": project_key},
+        "summary": summary,
+        "description": description or "",
+        "issuetype": {"name": issue_type},
+    }
+
+    if assignee:
+        issue_dict["assignee"] = {"name": assignee}
+
+    return issue_dict
+
+
 # =====================================================
 # ===============  COMMENT OPERATIONS  ================
 # =====================================================
@@ -61,8 +134,9 @@ def add_comment(ticket_key: str, comment_body: str) -> bool:
 
     try:
         jira = get_jira_client()
-        issue = jira.issue(ticket_key)
-        jira.add_comment(issue, comment_body)
+        # add_comment takes the key directly; no need to fetch the issue first
+        jira.add_comment(ticket_key, comment_body)
+        _ticket_changed(ticket_key)
 
         logger.info("Comment added to %s", ticket_key)
         return True
@@ -84,9 +158,9 @@ def transition_ticket(ticket_key: str, target_status: str) -> bool:
 
     try:
         jira = get_jira_client()
-        issue = jira.issue(ticket_key)
 
-        transitions = jira.transitions(issue)
+        # Both calls take the key directly; no need to fetch the issue first
+        transitions = jira.transitions(ticket_key)
         transition_id = None
 
         for t in transitions:
@@ -101,7 +175,8 @@ def transition_ticket(ticket_key: str, target_status: str) -> bool:
             else:
                 raise ValueError(f"No transitions available for {ticket_key}")
 
-        jira.transition_issue(issue, transition_id)
+        jira.transition_issue(ticket_key, transition_id)
+        _ticket_changed(ticket_key)
         logger.info("Transition successful: %s → %s", ticket_key, target_status)
         return True
 
@@ -122,8 +197,9 @@ def assign_ticket(ticket_key: str, assignee: str) -> bool:
 
     try:
         jira = get_jira_client()
-        issue = jira.issue(ticket_key)
+        issue = jira.issue(ticket_key, fields="key")  # Only needed as a handle for update()
         issue.update(fields={"assignee": {"name": assignee}})
+        _ticket_changed(ticket_key)
 
         logger.info("Assigned %s → %s", ticket_key, assignee)
         return True
@@ -137,21 +213,36 @@ def assign_ticket(ticket_key: str, assignee: str) -> bool:
 # ================ UPDATE SUMMARY =====================
 # =====================================================
 
-def update_ticket(ticket_key: str, summary: Optional[str] = None) -> bool:
+def update_ticket(
+    ticket_key: str,
+    summary: Optional[str] = None,
+    description: Optional[str] = None,
+    assignee: Optional[str] = None,
+    priority: Optional[str] = None,
+    labels: Optional[List[str]] = None,
+) -> bool:
     """
-    Update ticket summary (used by approval workflow).
+    Update ticket fields (used by approval workflow). Fields left as None are
+    not changed.
     """
     try:
-        jira = get_jira_client()
-        issue = jira.issue(ticket_key)
-
         update_payload = {}
         if summary:
             update_payload["summary"] = summary
+        if description is not None:
+            update_payload["description"] = description
+        if assignee:
+            update_payload["assignee"] = {"name": assignee}
+        if priority:
+            update_payload["priority"] = {"name": priority}
+        if labels is not None:
+            update_payload["labels"] = labels
 
         if update_payload:
+            issue = get_jira_client().issue(ticket_key, fields="key")  # Only needed as a handle for update()
             issue.update(fields=update_payload)
-            logger.info("Updated summary for %s", ticket_key)
+            _ticket_changed(ticket_key)
+            logger.info("Updated %s for %s", ", ".join(update_payload), ticket_key)
 
         return True
 
@@ -164,15 +255,17 @@ def update_ticket(ticket_key: str, summary: Optional[str] = None) -> bool:
 # =============== BASIC READ OPERATIONS ===============
 # =====================================================
 
-def search_tickets(jql: str, max_results: int = 50) -> List[Any]:
+def search_tickets(jql: str, max_results: int = 50, fields: Optional[str] = None) -> List[Any]:
     """
     Search tickets using JQL.
+    Pass fields (e.g. "created,status") to load what the caller needs in the
+    search itself instead of fetching each issue again afterwards.
     """
     logger.info("Searching: %s", jql)
 
     try:
         jira = get_jira_client()
-        return jira.search_issues(jql, maxResults=max_results)
+        return jira.search_issues(jql, maxResults=max_results, fields=fields)
 
     except JIRAError as e:
         logger.error("JQL search failed: %s", e)
@@ -182,12 +275,21 @@ def search_tickets(jql: str, max_results: int = 50) -> List[Any]:
 def get_ticket_details(ticket_key: str) -> Dict[str, Any]:
     """
     Return basic ticket details used by summarization and UI.
+    Results are cached for DETAILS_CACHE_TTL seconds; writes made through this
+    module evict the ticket they change.
     """
+    cache_key = ticket_key.upper()
+    with _details_cache_lock:
+        cached = _details_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < DETAILS_CACHE_TTL:
+            _details_cache.move_to_end(cache_key)
+            return dict(cached[1])
+
     try:
         jira = get_jira_client()
-        issue = jira.issue(ticket_key)
+        issue = jira.issue(ticket_key, fields=DETAILS_FIELDS)
 
-        return {
+        details = {
             "key": issue.key,
             "summary": issue.fields.summary,
             "description": issue.fields.description,
@@ -197,6 +299,13 @@ def get_ticket_details(ticket_key: str) -> Dict[str, Any]:
             "comments": [c.body for c in issue.fields.comment.comments] if issue.fields.comment else []
         }
 
+        with _details_cache_lock:
+            _details_cache[cache_key] = (time.monotonic(), details)
+            _details_cache.move_to_end(cache_key)
+            while len(_details_cache) > DETAILS_CACHE_SIZE:
+                _details_cache.popitem(last=False)
+        return dict(details)
+
     except JIRAError as e:
         logger.error("Failed to fetch ticket details: %s", e)
         raise
@@ -6,11 +6,11 @@ import logging
 from typing import Optional, Dict, List, Any
 from tools.jira_operations import (
     create_ticket as _create_ticket,
+    create_tickets as _create_tickets,
     update_ticket as _update_ticket,
     transition_ticket as _transition_ticket,
     add_comment as _add_comment,
     assign_ticket as _assign_ticket,
-    bulk_update_tickets as _bulk_update_tickets,
     get_ticket_details
 )
 from approval.approval_manager import approval_manager, ApprovalRequest
@@ -31,7 +31,7 @@ def create_ticket_with_approval(
     Create a ticket approval request. Returns approval request, does NOT create ticket.
     User must approve before ticket is created.
     """
-    logger.info("create_ticket_with_approval called for project_key=%s, summary=%s", project_key, summary)
+    logger.debug("create_ticket_with_approval called for project_key=%s, summary=%s", project_key, summary)
 
     preview = {
         "project": project_key,
@@ -53,28 +53,21 @@ def create_ticket_with_approval(
     )
     
     logger.info("Created approval request for ticket creation: %s", approval.request_id)
-    logger.info("create_ticket_with_approval completed for request_id=%s", approval.request_id)
     return approval
 
 
 def execute_create_ticket(approval_request_id: str) -> str:
-    logger.info("execute_create_ticket called for approval_request_id=%s", approval_request_id)
     """
     Execute ticket creation after approval.
     
     Returns:
         Ticket key if successful
     """
+    logger.debug("execute_create_ticket called for approval_request_id=%s", approval_request_id)
     if not approval_manager.is_approved(approval_request_id):
         raise ValueError(f"Approval request {approval_request_id} not approved")
     
-    approval = approval_manager.get_approval(approval_request_id)
-    if not approval:
-        # Check history
-        for hist_approval in approval_manager.approval_history:
-            if hist_approval.request_id == approval_request_id:
-                approval = hist_approval
-                break
+    approval = approval_manager.find(approval_request_id)
     
     if not approval or approval.status.value != "approved":
         raise ValueError(f"Approval request {approval_request_id} not approved")
@@ -87,16 +80,44 @@ def execute_create_ticket(approval_request_id: str) -> str:
         description=preview["description"],
         issue_type=preview.get("issue_type", "Task"),
         assignee=preview.get("assignee") if preview.get("assignee") != "Unassigned" else None,
-        priority=preview.get("priority"),
-        labels=preview.get("labels"),
-        custom_fields=preview.get("custom_fields")
     )
     
     logger.info("Ticket created after approval: %s", ticket_key)
-    logger.info("execute_create_ticket completed for ticket_key=%s", ticket_key)
     return ticket_key
 
 
+def execute_create_tickets(approval_request_ids: List[str]) -> List[Dict[str, Optional[str]]]:
+    """
+    Execute several approved ticket creations with one bulk request.
+    
+    Returns:
+        One {"key", "error"} dict per approval request, in the given order
+    """
+    logger.debug("execute_create_tickets called for %d approval requests", len(approval_request_ids))
+    results = []
+    tickets = []
+    for approval_request_id in approval_request_ids:
+        approval = approval_manager.find(approval_request_id)
+        if not approval or approval.status.value != "approved":
+            # Report it in its slot and still create the approved ones
+            results.append({"key": None, "error": f"Approval request {approval_request_id} not approved"})
+            continue
+        preview = approval.preview
+        results.append(None)
+        tickets.append({
+            "project_key": preview["project"],
+            "summary": preview["summary"],
+            "description": preview["description"],
+            "issue_type": preview.get("issue_type", "Task"),
+            "assignee": preview.get("assignee") if preview.get("assignee") != "Unassigned" else None,
+        })
+    
+    created = iter(_create_tickets(tickets) if tickets else [])
+    results = [result if result is not None else next(created) for result in results]
+    logger.info("Tickets created after approval: %s", [r["key"] for r in results])
+    return results
+
+
 def update_ticket_with_approval(
     ticket_key: str,
     summary: Optional[str] = None,
@@ -110,7 +131,7 @@ def update_ticket_with_approval(
     """
     Create an update approval request. Returns approval request, does NOT update ticket.
     """
-    logger.info("update_ticket_with_approval called for ticket_key=%s", ticket_key)
+    logger.debug("update_ticket_with_approval called for ticket_key=%s", ticket_key)
 
     # Get current ticket details for comparison
     try:
@@ -124,7 +145,7 @@ def update_ticket_with_approval(
         "current_summary": current.get("summary"),
         "new_summary": summary,
         "current_description": current.get("description", "")[:100] + "..." if current.get("description") else None,
-        "new_description": description[:100] + "..." if description else None,
+        "new_description": description,  # Full text; this is what gets written
         "current_assignee": current.get("assignee"),
         "new_assignee": assignee,
         "current_status": current.get("status"),
@@ -144,6 +165,10 @@ def update_ticket_with_approval(
         changes.append(f"Status: '{current.get('status')}' → '{status}'")
     if priority and priority != current.get("priority"):
         changes.append(f"Priority: '{current.get('priority')}' → '{priority}'")
+    if description is not None:
+        changes.append("Description replaced")
+    if labels is not None:
+        changes.append(f"Labels: {', '.join(labels) or '(none)'}")
     
     description_text = f"Update ticket {ticket_key}\nChanges:\n" + "\n".join(f"  - {c}" for c in changes)
     
@@ -155,22 +180,16 @@ def update_ticket_with_approval(
     )
     
     logger.info("Created approval request for ticket update: %s", approval.request_id)
-    logger.info("update_ticket_with_approval completed for request_id=%s", approval.request_id)
     return approval
 
 
 def execute_update_ticket(approval_request_id: str) -> bool:
-    logger.info("execute_update_ticket called for approval_request_id=%s", approval_request_id)
     """Execute ticket update after approval."""
+    logger.debug("execute_update_ticket called for approval_request_id=%s", approval_request_id)
     if not approval_manager.is_approved(approval_request_id):
         raise ValueError(f"Approval request {approval_request_id} not approved")
     
-    approval = approval_manager.get_approval(approval_request_id)
-    if not approval:
-        for hist_approval in approval_manager.approval_history:
-            if hist_approval.request_id == approval_request_id:
-                approval = hist_approval
-                break
+    approval = approval_manager.find(approval_request_id)
     
     if not approval or approval.status.value != "approved":
         raise ValueError(f"Approval request {approval_request_id} not approved")
@@ -183,14 +202,14 @@ def execute_update_ticket(approval_request_id: str) -> bool:
         summary=preview.get("new_summary"),
         description=preview.get("new_description"),
         assignee=preview.get("new_assignee"),
-        status=preview.get("new_status"),
         priority=preview.get("new_priority"),
         labels=preview.get("new_labels"),
-        custom_fields=preview.get("custom_fields")
     )
+    # Status can't be set as a field; it moves through a workflow transition
+    if preview.get("new_status"):
+        _transition_ticket(ticket_key, preview["new_status"])
     
     logger.info("Ticket updated after approval: %s", ticket_key)
-    logger.info("execute_update_ticket completed for ticket_key=%s", ticket_key)
     return success
 
 
@@ -200,7 +219,7 @@ def transition_ticket_with_approval(
     comment: Optional[str] = None
 ) -> ApprovalRequest:
     """Create a transition approval request."""
-    logger.info("transition_ticket_with_approval called for ticket_key=%s, target_status=%s", ticket_key, target_status)
+    logger.debug("transition_ticket_with_approval called for ticket_key=%s, target_status=%s", ticket_key, target_status)
 
     try:
         current = get_ticket_details(ticket_key)
@@ -227,22 +246,16 @@ def transition_ticket_with_approval(
     )
     
     logger.info("Created approval request for ticket transition: %s", approval.request_id)
-    logger.info("transition_ticket_with_approval completed for request_id=%s", approval.request_id)
     return approval
 
 
 def execute_transition_ticket(approval_request_id: str) -> bool:
-    logger.info("execute_transition_ticket called for approval_request_id=%s", approval_request_id)
     """Execute ticket transition after approval."""
+    logger.debug("execute_transition_ticket called for approval_request_id=%s", approval_request_id)
     if not approval_manager.is_approved(approval_request_id):
         raise ValueError(f"Approval request {approval_request_id} not approved")
     
-    approval = approval_manager.get_approval(approval_request_id)
-    if not approval:
-        for hist_approval in approval_manager.approval_history:
-            if hist_approval.request_id == approval_request_id:
-                approval = hist_approval
-                break
+    approval = approval_manager.find(approval_request_id)
     
     if not approval or approval.status.value != "approved":
         raise ValueError(f"Approval request {approval_request_id} not approved")
@@ -252,17 +265,17 @@ def execute_transition_ticket(approval_request_id: str) -> bool:
     success = _transition_ticket(
         ticket_key=preview["ticket_key"],
         target_status=preview["target_status"],
-        comment=preview.get("comment")
     )
+    if preview.get("comment"):
+        _add_comment(preview["ticket_key"], preview["comment"])
     
     logger.info("Ticket transitioned after approval: %s", preview["ticket_key"])
-    logger.info("execute_transition_ticket completed for ticket_key=%s", preview["ticket_key"])
     return success
 
 
 def assign_ticket_with_approval(ticket_key: str, assignee: str) -> ApprovalRequest:
-    logger.info("assign_ticket_with_approval called for ticket_key=%s, assignee=%s", ticket_key, assignee)
     """Create an assignment approval request."""
+    logger.debug("assign_ticket_with_approval called for ticket_key=%s, assignee=%s", ticket_key, assignee)
     try:
         current = get_ticket_details(ticket_key)
     except Exception as e:
@@ -287,22 +300,16 @@ def assign_ticket_with_approval(ticket_key: str, assignee: str) -> ApprovalReque
     )
     
     logger.info("Created approval request for ticket assignment: %s", approval.request_id)
-    logger.info("assign_ticket_with_approval completed for request_id=%s", approval.request_id)
     return approval
 
 
 def execute_assign_ticket(approval_request_id: str) -> bool:
-    logger.info("execute_assign_ticket called for approval_request_id=%s", approval_request_id)
     """Execute ticket assignment after approval."""
+    logger.debug("execute_assign_ticket called for approval_request_id=%s", approval_request_id)
     if not approval_manager.is_approved(approval_request_id):
         raise ValueError(f"Approval request {approval_request_id} not approved")
     
-    approval = approval_manager.get_approval(approval_request_id)
-    if not approval:
-        for hist_approval in approval_manager.approval_history:
-            if hist_approval.request_id == approval_request_id:
-                approval = hist_approval
-                break
+    approval = approval_manager.find(approval_request_id)
     
     if not approval or approval.status.value != "approved":
         raise ValueError(f"Approval request {approval_request_id} not approved")
@@ -315,13 +322,12 @@ def execute_assign_ticket(approval_request_id: str) -> bool:
     )
     
     logger.info("Ticket assigned after approval: %s", preview["ticket_key"])
-    logger.info("execute_assign_ticket completed for ticket_key=%s", preview["ticket_key"])
     return success
 
 
 def add_comment_with_approval(ticket_key: str, comment_body: str, visibility: Optional[str] = None) -> ApprovalRequest:
-    logger.info("add_comment_with_approval called for ticket_key=%s", ticket_key)
     """Create a comment approval request."""
+    logger.debug("add_comment_with_approval called for ticket_key=%s", ticket_key)
     preview = {
         "ticket_key": ticket_key,
         "comment": comment_body,
@@ -338,22 +344,16 @@ def add_comment_with_approval(ticket_key: str, comment_body: str, visibility: Op
     )
     
     logger.info("Created approval request for comment: %s", approval.request_id)
-    logger.info("add_comment_with_approval completed for request_id=%s", approval.request_id)
     return approval
 
 
 def execute_add_comment(approval_request_id: str) -> bool:
-    logger.info("execute_add_comment called for approval_request_id=%s", approval_request_id)
     """Execute comment addition after approval."""
+    logger.debug("execute_add_comment called for approval_request_id=%s", approval_request_id)
     if not approval_manager.is_approved(approval_request_id):
         raise ValueError(f"Approval request {approval_request_id} not approved")
     
-    approval = approval_manager.get_approval(approval_request_id)
-    if not approval:
-        for hist_approval in approval_manager.approval_history:
-            if hist_approval.request_id == approval_request_id:
-                approval = hist_approval
-                break
+    approval = approval_manager.find(approval_request_id)
     
     if not approval or approval.status.value != "approved":
         raise ValueError(f"Approval request {approval_request_id} not approved")
@@ -363,10 +363,18 @@ def execute_add_comment(approval_request_id: str) -> bool:
     success = _add_comment(
         ticket_key=preview["ticket_key"],
         comment_body=preview["comment"],
-        visibility=preview.get("visibility")
     )
     
     logger.info("Comment added after approval to ticket: %s", preview["ticket_key"])
-    logger.info("execute_add_comment completed for ticket_key=%s", preview["ticket_key"])
     return success
 
+
+# operation_type -> executor; the single dispatch table for approved
+# operations, used by the graph and by ApprovalManager.execute_approved_action
+EXECUTORS = {
+    "create_ticket": execute_create_ticket,
+    "update_ticket": execute_update_ticket,
+    "transition_ticket": execute_transition_ticket,
+    "assign_ticket": execute_assign_ticket,
+    "add_comment": execute_add_comment,
+}
@@ -1,9 +1,11 @@
 import os
-import pandas as pd
-import pdfplumber
-import requests
 import logging
-from docx import Document
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from jira import JIRA
 from jira.exceptions import JIRAError
 from config.settings import settings
@@ -25,36 +27,107 @@ PDF_EXTENSIONS = {".pdf"}
 EXCEL_EXTENSIONS = {".xls", ".xlsx"}
 WORD_EXTENSIONS = {".docx"}  # Removed .doc
 CHUNK_SIZE = 8000  # Characters per chunk for LLM summarization
+STATUS_CACHE_TTL = 300  # Seconds before the Jira status list is refetched
+LIST_FIELDS = "summary,status"  # Issue fields needed to render ticket lists
+SUMMARY_FIELDS = "summary,status,reporter,assignee,description,comment,attachment,updated"  # Fields read when summarizing
+JIRA_POOL_SIZE = 20  # Keep-alive connections kept open to the Jira host
 
-def get_jira_client():
-    logger.info("get_jira_client called")
-    """Initialize and return a Jira client using settings from config."""
+SUMMARY_CACHE_SIZE = 512  # Max ticket summaries kept in memory
+QUERY_CACHE_TTL = 30  # Seconds a ticket list is reused
+QUERY_CACHE_SIZE = 128  # Max ticket lists kept in memory
+
+_status_cache = {"ts": 0.0, "values": None}
+
+# query -> (fetched_at, result) for ticket lists, least recently used first.
+# Writes made through jira_operations call clear_query_cache(), so lists never
+# show a change as missing.
+_query_cache = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+# (ticket_key, updated) -> summary, least recently used first. Keying on the
+# ticket's "updated" timestamp means any edit to the ticket misses the cache.
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+# Optional on-disk copy of _summary_cache (settings.SUMMARY_CACHE_PATH) so
+# summaries survive restarts. Opened lazily; guarded by _summary_cache_lock.
+_summary_db = None
+_summary_db_disabled = False  # Set when the file can't be opened; stops retries
+
+_jira_client = None
+_jira_client_lock = threading.Lock()
+
+def _create_jira_client():
+    """Initialize a Jira client using settings from config."""
     logger.info("Initializing Jira client")
     try:
         jira = JIRA(
             server=settings.JIRA_BASE_URL,
             basic_auth=(settings.JIRA_USERNAME, settings.JIRA_PAT)
         )
+        # The client is shared across threads (summary fan-out, web requests);
+        # size its connection pool so they reuse keep-alive connections instead
+        # of opening new TLS sessions. Retries stay with the client's own
+        # ResilientSession.
+        # jira 3.x builds that session itself and has no public option to pass
+        # one in or size its pool, so this is the one place we reach into
+        # _session. It's why requirements pin jira below 4; recheck on upgrade.
+        adapter = HTTPAdapter(pool_connections=JIRA_POOL_SIZE, pool_maxsize=JIRA_POOL_SIZE)
+        jira._session.mount("https://", adapter)
+        jira._session.mount("http://", adapter)
         logger.debug("Jira client initialized successfully")
-        logger.info("get_jira_client completed")
         return jira
     except JIRAError as e:
         logger.error("Failed to initialize Jira client: %s", e)
         raise
 
+def get_jira_client():
+    """Return the shared Jira client, creating it on first use."""
+    global _jira_client
+    jira = _jira_client
+    if jira is None:
+        with _jira_client_lock:
+            jira = _jira_client
+            if jira is None:
+                jira = _jira_client = _create_jira_client()
+    return jira
+
+def _get_cached_query(query):
+    """Return the cached result for query, or None if absent or older than QUERY_CACHE_TTL."""
+    with _query_cache_lock:
+        cached = _query_cache.get(query)
+        if cached is not None and time.monotonic() - cached[0] < QUERY_CACHE_TTL:
+            _query_cache.move_to_end(query)
+            return cached[1]
+        return None
+
+def _cache_query(query, result):
+    with _query_cache_lock:
+        _query_cache[query] = (time.monotonic(), result)
+        _query_cache.move_to_end(query)
+        while len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+
+def clear_query_cache():
+    """Forget cached ticket lists; called after every write."""
+    with _query_cache_lock:
+        _query_cache.clear()
+
 def fetch_tickets_by_status(status: str = None):
-    logger.info("fetch_tickets_by_status called with status=%s", status)
     """
     Fetch tickets assigned to or reported by the current user.
     Optionally filter by status (e.g., 'Closed', 'In Progress').
     Returns a clean multiline string for UI display.
     """
+    logger.debug("fetch_tickets_by_status called with status=%s", status)
+    query = ("tickets_by_status", (status or "").lower())
+    cached = _get_cached_query(query)
+    if cached is not None:
+        logger.info("Using cached ticket list for status=%s", status)
+        return cached
+
     try:
         jira = get_jira_client()
-        current_user = jira.current_user()
-        profile = jira.user(current_user)
-        display_name = profile.displayName
-        logger.info("User display name: %s", display_name)
 
         # Build JQL
         status_clause = f" AND status = '{status}'" if status else ""
@@ -62,9 +135,12 @@ def fetch_tickets_by_status(status: str = None):
         assigned_jql = f"assignee = currentUser(){status_clause} ORDER BY updated DESC"
         reported_jql = f"reporter = currentUser(){status_clause} ORDER BY updated DESC"
 
-        # Fetch tickets
-        assigned_issues = jira.search_issues(assigned_jql, maxResults=None)
-        reported_issues = jira.search_issues(reported_jql, maxResults=None)
+        # Fetch both lists at once; only request the fields format_issue_list renders
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assigned_future = executor.submit(jira.search_issues, assigned_jql, maxResults=None, fields=LIST_FIELDS)
+            reported_future = executor.submit(jira.search_issues, reported_jql, maxResults=None, fields=LIST_FIELDS)
+            assigned_issues = assigned_future.result()
+            reported_issues = reported_future.result()
 
         def format_issue_list(issues):
             """Format issue list cleanly with bullets."""
@@ -92,7 +168,8 @@ def fetch_tickets_by_status(status: str = None):
         if not output.strip():
             output = f"No tickets found for status '{status}'." if status else "No tickets found."
 
-        logger.info("fetch_tickets_by_status completed successfully")
+        logger.debug("fetch_tickets_by_status completed")
+        _cache_query(query, output.strip())
         return output.strip()
 
     except Exception as e:
@@ -100,7 +177,6 @@ def fetch_tickets_by_status(status: str = None):
         raise
 
 def summarize_large_text(text: str, llm):
-    logger.info("summarize_large_text called with text length=%d", len(text))
     """Summarize large text by chunking it for LLM processing."""
     logger.info("Summarizing text of length: %d characters", len(text))
     summaries = []
@@ -113,15 +189,13 @@ def summarize_large_text(text: str, llm):
             ])
             summaries.append(response.content)
             logger.debug("Chunk summary generated")
-        logger.info("Text summarization completed")
-        logger.info("summarize_large_text completed")
+        logger.debug("Text summarization completed")
         return "\n".join(summaries)
     except Exception as e:
         logger.error("Error summarizing text: %s", e)
         raise
 
 def extract_text_from_attachment(filepath: str, ext: str):
-    logger.info("extract_text_from_attachment called for filepath=%s, ext=%s", filepath, ext)
     """Extract text from various file types (text, PDF, Excel, Word)."""
     logger.info("Extracting text from attachment: %s", filepath)
     try:
@@ -129,48 +203,109 @@ def extract_text_from_attachment(filepath: str, ext: str):
             with open(filepath, "r", encoding="utf-8") as f:
                 content = f.read()
                 logger.debug("Extracted text from %s", filepath)
-                logger.info("extract_text_from_attachment completed for text file: %s", filepath)
                 return content
         elif ext in PDF_EXTENSIONS:
+            # Parser libraries are heavy; import them only when an attachment needs one
+            import pdfplumber
             text = ""
             with pdfplumber.open(filepath) as pdf:
                 for page in pdf.pages:
                     text += page.extract_text() + "\n"
             logger.debug("Extracted text from PDF: %s", filepath)
-            logger.info("extract_text_from_attachment completed for PDF: %s", filepath)
             return text
         elif ext in EXCEL_EXTENSIONS:
+            import pandas as pd
             df = pd.read_excel(filepath, engine='openpyxl' if ext == ".xlsx" else None)
             content = df.to_csv(index=False)
             logger.debug("Converted Excel to CSV: %s", filepath)
-            logger.info("extract_text_from_attachment completed for Excel: %s", filepath)
             return content
         elif ext in WORD_EXTENSIONS:
             try:
+                from docx import Document
                 doc = Document(filepath)
                 content = "\n".join([p.text for p in doc.paragraphs])
                 logger.debug("Extracted text from Word document: %s", filepath)
-                logger.info("extract_text_from_attachment completed for Word: %s", filepath)
                 return content
             except Exception as e:
                 logger.error("Failed to extract from Word: %s", e)
                 return f"(Could not extract content from Word file: {e})"
         logger.warning("Unsupported file extension: %s", ext)
-        logger.info("extract_text_from_attachment completed: unsupported file type %s", ext)
         return "(Unsupported file type)"
     except Exception as e:
         logger.error("Failed to extract text from %s: %s", filepath, e)
         logger.info("extract_text_from_attachment failed for %s", filepath)
         return f"(Could not extract content: {e})"
 
+def _get_summary_db():
+    """Return the on-disk summary store, or None when it is disabled. Call with _summary_cache_lock held."""
+    global _summary_db, _summary_db_disabled
+    if _summary_db is None and settings.SUMMARY_CACHE_PATH and not _summary_db_disabled:
+        try:
+            path = os.path.expanduser(settings.SUMMARY_CACHE_PATH)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "ticket_key TEXT, updated TEXT, summary TEXT, "
+                "PRIMARY KEY (ticket_key, updated))"
+            )
+            db.commit()
+            _summary_db = db
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Summary cache at %s unavailable: %s", settings.SUMMARY_CACHE_PATH, e)
+            _summary_db_disabled = True
+    return _summary_db
+
+def _get_cached_summary(cache_key):
+    with _summary_cache_lock:
+        summary = _summary_cache.get(cache_key)
+        if summary is not None:
+            _summary_cache.move_to_end(cache_key)
+            return summary
+
+        db = _get_summary_db()
+        if db is None:
+            return None
+        row = db.execute(
+            "SELECT summary FROM summaries WHERE ticket_key = ? AND updated = ?", cache_key
+        ).fetchone()
+        if row is None:
+            return None
+        _summary_cache[cache_key] = row[0]
+        while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+        return row[0]
+
+def _cache_summary(cache_key, summary):
+    with _summary_cache_lock:
+        _summary_cache[cache_key] = summary
+        _summary_cache.move_to_end(cache_key)
+        while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+        db = _get_summary_db()
+        if db is not None:
+            # Older summaries of the same ticket can never hit again
+            db.execute("DELETE FROM summaries WHERE ticket_key = ?", (cache_key[0],))
+            db.execute("INSERT INTO summaries VALUES (?, ?, ?)", (*cache_key, summary))
+            db.commit()
+
 def fetch_and_summarize_ticket(ticket_key: str):
-    logger.info("fetch_and_summarize_ticket called for ticket_key=%s", ticket_key)
     """Fetch and summarize a Jira ticket, including comments and attachments."""
     logger.info("Fetching and summarizing ticket: %s", ticket_key)
     os.makedirs(ATTACHMENT_DIR, exist_ok=True)
     try:
         jira = get_jira_client()
-        issue = jira.issue(ticket_key)  # Removed unused expand parameters
+
+        # Cheap probe for the last-modified time; reuse the summary if the
+        # ticket hasn't changed since it was produced
+        updated = jira.issue(ticket_key, fields="updated").fields.updated
+        cached = _get_cached_summary((ticket_key.upper(), updated))
+        if cached is not None:
+            logger.info("Using cached summary for ticket %s", ticket_key)
+            return cached
+
+        issue = jira.issue(ticket_key, fields=SUMMARY_FIELDS)
         logger.debug("Fetched ticket: %s", ticket_key)
 
         summary_parts = [
@@ -198,9 +333,9 @@ def fetch_and_summarize_ticket(ticket_key: str):
                 filename = attachment.filename
                 filepath = os.path.join(ATTACHMENT_DIR, filename)
                 logger.debug("Downloading attachment: %s", filename)
-                response = requests.get(attachment.content, auth=(settings.JIRA_USERNAME, settings.JIRA_PAT))
+                # Download through the client's authenticated, pooled session
                 with open(filepath, "wb") as f:
-                    f.write(response.content)
+                    f.write(attachment.get())
                 logger.debug("Downloaded attachment: %s", filename)
 
                 ext = os.path.splitext(filename)[1].lower()
@@ -226,7 +361,7 @@ def fetch_and_summarize_ticket(ticket_key: str):
             HumanMessage(content=f"Summarize this Jira ticket including all details, comments, attachments, and history:\n\n{raw_text}")
         ])
         logger.info("Ticket %s summarized successfully", ticket_key)
-        logger.info("fetch_and_summarize_ticket completed for ticket_key=%s", ticket_key)
+        _cache_summary((issue.key, issue.fields.updated), response.content)
         return response.content
     except JIRAError as e:
         logger.error("JIRA error for ticket %s: %s", ticket_key, e)
@@ -237,16 +372,24 @@ def fetch_and_summarize_ticket(ticket_key: str):
         logger.error("Unexpected error summarizing ticket %s: %s", ticket_key, e)
         raise
 
-def fetch_statuses():
-    logger.info("fetch_statuses called")
-    """Return all possible Jira statuses (lowercased)."""
+def fetch_statuses(refresh: bool = False):
+    """
+    Return all possible Jira statuses (lowercased).
+    The list rarely changes, so it is cached for STATUS_CACHE_TTL seconds;
+    pass refresh=True to force a refetch.
+    """
+    cached = _status_cache["values"]
+    if not refresh and cached is not None and time.monotonic() - _status_cache["ts"] < STATUS_CACHE_TTL:
+        return list(cached)
+
     logger.info("Fetching available Jira statuses")
     try:
         jira = get_jira_client()
-        statuses = [s.name.lower() for s in jira.statuses()]
+        statuses = tuple(s.name.lower() for s in jira.statuses())
+        _status_cache["values"] = statuses
+        _status_cache["ts"] = time.monotonic()
         logger.info("Retrieved %d Jira statuses", len(statuses))
-        logger.info("fetch_statuses completed with %d statuses", len(statuses))
-        return statuses
+        return list(statuses)
     except Exception as e:
         logger.error("Error fetching Jira statuses: %s", e)
         raise
\ No newline at end of file
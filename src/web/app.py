@@ -2,9 +2,11 @@
 Web-based chatbot interface with authentication for JIRA agent.
 """
 import os
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Any, Optional, Dict
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
@@ -14,9 +16,10 @@ from passlib.context import CryptContext
 import secrets
 import csv
 
-from graphs.jira_agent_graph import app as langgraph_app
-from langchain_core.messages import HumanMessage, AIMessage
+from graphs.jira_agent_graph import app as langgraph_app, latest_ai_messages, thread_config
+from langchain_core.messages import HumanMessage
 from approval.approval_manager import approval_manager
+from models.llm_config import LLMConfig
 
 # ---------------------------------------------------------
 # Logging
@@ -24,10 +27,24 @@ from approval.approval_manager import approval_manager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ---------------------------------------------------------
+# LLM warm-up
+# ---------------------------------------------------------
+_llm_warmup: Optional[asyncio.Future] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the LLM in the background so the server can bind immediately."""
+    global _llm_warmup
+    _llm_warmup = asyncio.get_running_loop().run_in_executor(None, LLMConfig.get_llm)
+    yield
+
+
 # ---------------------------------------------------------
 # FastAPI App
 # ---------------------------------------------------------
-web_app = FastAPI(title="JIRA Agent Chatbot")
+web_app = FastAPI(title="JIRA Agent Chatbot", lifespan=lifespan)
 
 # ---------------------------------------------------------
 # Security / JWT
@@ -53,6 +70,9 @@ users_db: Dict[str, Dict] = {}
 active_sessions: Dict[str, Dict] = {}
 user_conversations: Dict[str, dict] = {}
 
+# Serialized pending approvals, reused until approval_manager.version changes
+_pending_approvals_cache: Dict[str, Any] = {"version": None, "approvals": []}
+
 USERS_CSV_PATH = os.path.join(os.path.dirname(__file__), "users.csv")
 
 
@@ -182,20 +202,7 @@ async def login(user_data: UserLogin):
     }
 
     if user_data.username not in user_conversations:
-        user_conversations[user_data.username] = {
-            "messages": [],
-            "state": {
-                "greeted": False,
-                "status_filter": None,
-                "ticket_to_summarize": None,
-                "pending_approval_id": None,
-                "operation_type": None,
-                "target_ticket_key": None,
-                "target_status": None,
-                "assignee": None,
-                "comment_body": None,
-            },
-        }
+        user_conversations[user_data.username] = {"messages": []}
 
     return {
         "access_token": access_token,
@@ -223,19 +230,14 @@ async def chat(message: ChatMessage):
     username = active_sessions[message.session_id]["username"]
     conversation = user_conversations[username]
 
-    # Prepare state
-    input_state = {**conversation["state"], "messages": [HumanMessage(content=message.message)]}
+    # Graph state is checkpointed per user; only the new message is sent
+    input_state = {"messages": [HumanMessage(content=message.message)]}
 
     # Invoke graph
-    result = langgraph_app.invoke(input_state)
-
-    # Extract AI responses
-    ai_responses = [
-        msg.content for msg in result.get("messages", []) if isinstance(msg, AIMessage)
-    ]
+    result = await langgraph_app.ainvoke(input_state, config=thread_config(username))
 
-    # 🔥 Preserve entire state except messages
-    conversation["state"] = {k: v for k, v in result.items() if k != "messages"}
+    # Extract this turn's AI responses
+    ai_responses = [msg.content for msg in latest_ai_messages(result.get("messages", []))]
 
     # Store history
     conversation["messages"].append(
@@ -249,7 +251,7 @@ async def chat(message: ChatMessage):
     user_conversations[username] = conversation
 
     # Pending approval info
-    pending_approvals = approval_manager.get_pending_approvals()
+    pending_approvals = approval_manager.get_pending_approvals(as_list=True)
     approval_info = None
     if pending_approvals:
         latest = pending_approvals[-1]
@@ -275,9 +277,9 @@ async def get_pending_approvals(session_id: str):
     if session_id not in active_sessions:
         raise HTTPException(status_code=401, detail="Invalid or expired session")
 
-    pending = approval_manager.get_pending_approvals()
-    return {
-        "approvals": [
+    version, pending = approval_manager.pending_snapshot()
+    if _pending_approvals_cache["version"] != version:
+        _pending_approvals_cache["approvals"] = [
             {
                 "request_id": a.request_id,
                 "operation_type": a.operation_type,
@@ -288,7 +290,9 @@ async def get_pending_approvals(session_id: str):
             }
             for a in pending
         ]
-    }
+        _pending_approvals_cache["version"] = version
+
+    return {"approvals": _pending_approvals_cache["approvals"]}
 
 
 @web_app.post("/api/approvals/{request_id}/approve")
@@ -297,8 +301,14 @@ async def approve_request(request_id: str, session_id: str):
         raise HTTPException(status_code=401, detail="Invalid or expired session")
 
     username = active_sessions[session_id]["username"]
-    approval_manager.approve(request_id, username)
-    result = approval_manager.execute_approved_action(request_id)           
+    if approval_manager.approve(request_id, username) is None:
+        existing = approval_manager.find(request_id)
+        if existing is None:
+            raise HTTPException(status_code=404, detail="Approval request not found")
+        raise HTTPException(status_code=409, detail=f"Approval request is already {existing.status.value}")
+
+    # Executing makes blocking Jira calls; keep them off the event loop
+    result = await asyncio.to_thread(approval_manager.execute_approved_action, request_id)
     return {"status": "approved", "result": result}
 
 
@@ -322,6 +332,15 @@ async def health():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 
+@web_app.get("/api/ready")
+async def ready():
+    if _llm_warmup is None or not _llm_warmup.done():
+        raise HTTPException(status_code=503, detail="LLM is still initializing")
+    if _llm_warmup.exception() is not None:
+        raise HTTPException(status_code=503, detail=f"LLM initialization failed: {_llm_warmup.exception()}")
+    return {"status": "ready", "timestamp": datetime.utcnow().isoformat()}
+
+
 # ---------------------------------------------------------
 # Main
 # ---------------------------------------------------------
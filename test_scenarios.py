@@ -3,6 +3,9 @@ Test scenarios for JIRA Agent Chatbot
 Run these to verify the system works correctly.
 """
 import os
+import select
+import signal
+import subprocess
 import sys
 import time
 from dotenv import load_dotenv
@@ -187,6 +190,180 @@ def test_web_server():
         return False
 
 
+def test_cli_interrupt():
+    """Test 8: Verify Ctrl+C at the CLI prompt exits the agent."""
+    print_test_header("CLI Interrupt")
+
+    if not hasattr(signal, "SIGINT") or os.name == "nt":
+        print("⚠️  Skipped: needs POSIX signals")
+        return True
+
+    main_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "main.py")
+    proc = subprocess.Popen(
+        [sys.executable, main_py],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        # Wait for the prompt, so the signal lands while input() is blocked
+        output = b""
+        deadline = time.monotonic() + 30
+        while b"You:" not in output and time.monotonic() < deadline:
+            ready, _, _ = select.select([proc.stdout], [], [], 0.5)
+            if ready:
+                output += os.read(proc.stdout.fileno(), 4096)
+        if b"You:" not in output:
+            print("❌ CLI never showed the prompt")
+            return False
+
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            print("❌ CLI still running 10s after Ctrl+C at the prompt")
+            return False
+
+        print(f"✅ CLI exited on Ctrl+C (exit code {proc.returncode})")
+        return True
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+def test_approval_expiry():
+    """Test 9: Verify the TTL sweep expires stale pending requests."""
+    print_test_header("Approval Expiry")
+
+    try:
+        from datetime import timedelta
+        from approval.approval_manager import ApprovalManager, ApprovalStatus
+        from config.settings import settings
+
+        manager = ApprovalManager()
+        stale = manager.create_approval_request("add_comment", {"comment": "stale"}, ticket_key="TEST-1")
+        fresh = manager.create_approval_request("add_comment", {"comment": "fresh"}, ticket_key="TEST-1")
+        stale.created_at -= timedelta(seconds=settings.APPROVAL_TTL_SECONDS + 1)
+
+        version = manager.version
+        expired = manager.sweep_expired()
+        if expired != 1 or stale.status != ApprovalStatus.EXPIRED:
+            print(f"❌ Expected the stale request to expire, swept {expired}")
+            return False
+        if [a.request_id for a in manager.get_pending_approvals()] != [fresh.request_id]:
+            print("❌ Pending list should only hold the fresh request")
+            return False
+        if manager.version == version:
+            print("❌ Sweeping did not bump the version")
+            return False
+        if manager.approve(stale.request_id) is not None:
+            print("❌ An expired request could still be approved")
+            return False
+
+        print("✅ Stale request expired; fresh request still pending")
+        return True
+
+    except Exception as e:
+        print(f"❌ Approval expiry test failed: {e}")
+        return False
+
+
+def test_multi_approve():
+    """Test 10: Verify approving several request IDs in one command."""
+    print_test_header("Multi-ID Approve")
+
+    try:
+        from approval.approval_manager import approval_manager, ApprovalStatus
+        from graphs import jira_agent_graph as graph
+
+        first = approval_manager.create_approval_request("add_comment", {"comment": "one"}, ticket_key="TEST-1")
+        second = approval_manager.create_approval_request("add_comment", {"comment": "two"}, ticket_key="TEST-2")
+        unknown = "0" * 32
+
+        command = f"approve {first.request_id}, {second.request_id} {unknown}"
+        result = graph._approve_command(graph.PATTERNS["approve"].fullmatch(command))
+
+        if result.get("approved_request_ids") != [first.request_id, second.request_id]:
+            print(f"❌ Unexpected approved IDs: {result.get('approved_request_ids')}")
+            return False
+        if first.status != ApprovalStatus.APPROVED or second.status != ApprovalStatus.APPROVED:
+            print("❌ Not every listed request was approved")
+            return False
+        if result.get("next_node") != "execute":
+            print("❌ Approved requests were not routed to execution")
+            return False
+        if not any(unknown in m.content for m in result["messages"]):
+            print("❌ The unknown ID was not reported")
+            return False
+
+        print("✅ Both requests approved; unknown ID reported")
+        return True
+
+    except Exception as e:
+        print(f"❌ Multi-ID approve test failed: {e}")
+        return False
+
+
+def test_execution_order():
+    """Test 11: Verify operations on one ticket run in approval order."""
+    print_test_header("Per-Ticket Execution Order")
+
+    import asyncio
+
+    try:
+        from approval.approval_manager import approval_manager
+        from graphs import jira_agent_graph as graph
+
+        finished = []
+
+        def fake_executor(delay):
+            def run(approval_id):
+                time.sleep(delay)
+                finished.append(approval_id)
+                return approval_id
+            return run
+
+        # The first operation on TEST-1 is the slowest, so if the two ran
+        # concurrently the second would finish first
+        ops = [
+            ("add_comment", "TEST-1", 0.3),
+            ("transition_ticket", "TEST-1", 0.0),
+            ("assign_ticket", "TEST-2", 0.0),
+        ]
+        ids = []
+        for op_type, ticket_key, _ in ops:
+            approval = approval_manager.create_approval_request(op_type, {}, ticket_key=ticket_key)
+            approval_manager.approve(approval.request_id)
+            ids.append(approval.request_id)
+
+        original = graph.EXECUTORS
+        graph.EXECUTORS = {op_type: fake_executor(delay) for op_type, _, delay in ops}
+        try:
+            result = asyncio.run(graph.execute_node({
+                "pending_approval_id": ids[0],
+                "operation_type": ops[0][0],
+                "approved_request_ids": ids,
+            }))
+        finally:
+            graph.EXECUTORS = original
+
+        same_ticket = [aid for aid in finished if aid in ids[:2]]
+        if same_ticket != ids[:2]:
+            print("❌ Operations on TEST-1 ran out of approval order")
+            return False
+        if len(result["messages"]) != len(ids) or any("❌" in m.content for m in result["messages"]):
+            print("❌ Expected one success message per approval")
+            return False
+
+        print("✅ Same-ticket operations ran in order; one message per approval")
+        return True
+
+    except Exception as e:
+        print(f"❌ Execution order test failed: {e}")
+        return False
+
+
 def run_all_tests():
     """Run all tests."""
     print("\n" + "="*60)
@@ -201,6 +378,10 @@ def run_all_tests():
         ("Approval System", test_approval_system),
         ("Read Operations", test_read_operations),
         ("Web Server", test_web_server),
+        ("CLI Interrupt", test_cli_interrupt),
+        ("Approval Expiry", test_approval_expiry),
+        ("Multi-ID Approve", test_multi_approve),
+        ("Per-Ticket Execution Order", test_execution_order),
     ]
     
     results = []